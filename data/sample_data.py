@@ -1,14 +1,28 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
 
-def generate_sample_data(num_items=20):
+# Low-cardinality descriptor columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['category', 'store_location', 'store_type', 'store_size', 'supplier']
+
+# Numeric dtypes: counts and day spans fit in int16; prices and the sell-through
+# rate feed the money columns, so they stay float64 to keep those exact to the cent
+NUMERIC_DTYPES = {
+    'quantity': np.int16,
+    'shelf_life_days': np.int16,
+    'current_age_days': np.int16,
+    'days_remaining': np.int16,
+    'last_week_sales': np.int16,
+    'cost_basis': np.float64,
+    'selling_price': np.float64,
+    'sale_through_rate': np.float64,
+    'avg_daily_sales': np.float32
+}
+
+def generate_sample_data(num_items=20, seed=42):
     """
     Generate sample inventory data with equal distribution across all cases
     """
-    np.random.seed(42)  # For reproducible results
-    random.seed(42)
+    rng = np.random.default_rng(seed)  # For reproducible results
     
     # Product categories and their typical characteristics
     categories = {
@@ -34,8 +48,6 @@ def generate_sample_data(num_items=20):
     
     stores = ['Store_A', 'Store_B', 'Store_C']
     
-    data = []
-    
     # Calculate items per category for equal distribution
     items_per_category = num_items // 3
     remaining_items = num_items % 3
@@ -46,127 +58,157 @@ def generate_sample_data(num_items=20):
         'General Goods': items_per_category
     }
     
-    # Risk level distribution for each category
-    risk_levels = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+    # Risk level distribution for each category: LOW, MEDIUM, HIGH, CRITICAL
+    num_risk_levels = 4
+    # Current age window as a fraction of shelf life (CRITICAL runs up to shelf_life - 1)
+    age_fractions = np.array([[0.0, 0.3], [0.3, 0.6], [0.6, 0.8], [0.8, 1.0]])
+    # Sale through rate range: good, moderate, poor and very poor performance
+    sale_through_ranges = np.array([[0.65, 0.95], [0.45, 0.65], [0.25, 0.45], [0.05, 0.25]])
     
-    item_id = 1
+    # Each category is generated as one batch of column arrays
+    batches = []
     
     for category, count in category_counts.items():
         cat_info = categories[category]
         
-        # Distribute risk levels evenly within each category
-        risk_per_level = count // 4
-        risk_distribution = [risk_per_level] * 4
-        # Add remaining items to different risk levels
-        for i in range(count % 4):
+        # Distribute risk levels evenly within each category, in random order
+        risk_distribution = [count // num_risk_levels] * num_risk_levels
+        for i in range(count % num_risk_levels):
             risk_distribution[i] += 1
+        target_risk = rng.permutation(np.repeat(np.arange(num_risk_levels), risk_distribution))
+        
+        # Generate shelf life and current age based on target risk level
+        shelf_life = rng.integers(*cat_info['shelf_life_range'], size=count, endpoint=True)
+        age_low = (shelf_life * age_fractions[target_risk, 0]).astype(int)
+        age_high = np.where(
+            target_risk == num_risk_levels - 1,
+            shelf_life - 1,
+            (shelf_life * age_fractions[target_risk, 1]).astype(int)
+        )
+        current_age = rng.integers(age_low, age_high, endpoint=True)
+        days_remaining = np.maximum(0, shelf_life - current_age)
+        
+        sale_through_rate = rng.uniform(
+            sale_through_ranges[target_risk, 0],
+            sale_through_ranges[target_risk, 1]
+        )
         
-        risk_items = []
-        for i, risk_level in enumerate(risk_levels):
-            risk_items.extend([risk_level] * risk_distribution[i])
+        # Generate realistic pricing (cost first, then selling price above it)
+        cost_basis = np.round(rng.uniform(*cat_info['cost_range'], size=count), 2)
+        margin_multiplier = rng.uniform(*cat_info['margin_multiplier'], size=count)
+        selling_price = np.round(cost_basis * margin_multiplier, 2)
         
-        random.shuffle(risk_items)
+        quantity = rng.integers(5, 100, size=count, endpoint=True)
         
-        for i in range(count):
-            target_risk = risk_items[i]
-            
-            # Generate basic product info
-            product_name = random.choice(cat_info['products'])
-            sku = f"{category[:4].upper()}_{item_id:03d}"
-            
-            # Generate shelf life
-            shelf_life = random.randint(*cat_info['shelf_life_range'])
-            
-            # Generate current age based on target risk level
-            if target_risk == 'LOW':
-                current_age = random.randint(0, int(shelf_life * 0.3))
-            elif target_risk == 'MEDIUM':
-                current_age = random.randint(int(shelf_life * 0.3), int(shelf_life * 0.6))
-            elif target_risk == 'HIGH':
-                current_age = random.randint(int(shelf_life * 0.6), int(shelf_life * 0.8))
-            else:  # CRITICAL
-                current_age = random.randint(int(shelf_life * 0.8), shelf_life - 1)
-            
-            days_remaining = max(0, shelf_life - current_age)
-            
-            # Generate sale_through_rate based on target risk and ensure it's realistic
-            if target_risk == 'LOW':
-                sale_through_rate = random.uniform(0.65, 0.95)  # Good performance
-            elif target_risk == 'MEDIUM':
-                sale_through_rate = random.uniform(0.45, 0.65)  # Moderate performance
-            elif target_risk == 'HIGH':
-                sale_through_rate = random.uniform(0.25, 0.45)  # Poor performance
-            else:  # CRITICAL
-                sale_through_rate = random.uniform(0.05, 0.25)  # Very poor performance
-            
-            # Generate realistic pricing (cost first, then selling price)
-            cost_basis = round(random.uniform(*cat_info['cost_range']), 2)
-            
-            # Ensure selling price is always higher than cost
-            margin_multiplier = random.uniform(*cat_info['margin_multiplier'])
-            selling_price = round(cost_basis * margin_multiplier, 2)
-            
-            # Generate quantities
-            quantity = random.randint(5, 100)
-            
-            # Calculate dates
-            today = datetime.now()
-            expiry_date = today + timedelta(days=days_remaining)
-            
-            # Generate sales data
-            avg_daily_sales = round(quantity * sale_through_rate / 7, 1)
-            last_week_sales = int(avg_daily_sales * 7 * random.uniform(0.8, 1.2))
-            
-            data.append({
-                'sku': sku,
-                'product_name': product_name,
-                'category': category,
-                'quantity': quantity,
-                'cost_basis': cost_basis,
-                'selling_price': selling_price,
-                'shelf_life_days': shelf_life,
-                'current_age_days': current_age,
-                'days_remaining': days_remaining,
-                'expiry_date': expiry_date.strftime('%d/%m/%Y'),
-                'sale_through_rate': round(sale_through_rate, 2),
-                'avg_daily_sales': avg_daily_sales,
-                'last_week_sales': last_week_sales,
-                'store_location': random.choice(stores),
-                'store_type': random.choice(['Urban', 'Suburban', 'Rural']),
-                'store_size': random.choice(['Large', 'Medium', 'Small']),
-                'supplier': f"Supplier_{random.randint(1, 5)}"
-            })
-            
-            item_id += 1
-    
-    return pd.DataFrame(data)
+        # Generate sales data
+        avg_daily_sales = np.round(quantity * sale_through_rate / 7, 1)
+        last_week_sales = (avg_daily_sales * 7 * rng.uniform(0.8, 1.2, size=count)).astype(int)
+        
+        batches.append({
+            'product_name': rng.choice(cat_info['products'], size=count),
+            'category': np.full(count, category, dtype=object),
+            'quantity': quantity,
+            'cost_basis': cost_basis,
+            'selling_price': selling_price,
+            'shelf_life_days': shelf_life,
+            'current_age_days': current_age,
+            'days_remaining': days_remaining,
+            'sale_through_rate': np.round(sale_through_rate, 2),
+            'avg_daily_sales': avg_daily_sales,
+            'last_week_sales': last_week_sales,
+            'store_location': rng.choice(stores, size=count),
+            'store_type': rng.choice(['Urban', 'Suburban', 'Rural'], size=count),
+            'store_size': rng.choice(['Large', 'Medium', 'Small'], size=count),
+            'supplier': np.char.add('Supplier_', rng.integers(1, 5, size=count, endpoint=True).astype(str))
+        })
+    
+    columns = {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+    for name, dtype in NUMERIC_DTYPES.items():
+        columns[name] = columns[name].astype(dtype)
+    
+    skus = [f"{category[:4].upper()}_{item_id:03d}" for item_id, category in enumerate(columns['category'], start=1)]
+    
+    df = pd.DataFrame({
+        'sku': skus,
+        'product_name': columns['product_name'],
+        'category': columns['category'],
+        'quantity': columns['quantity'],
+        'cost_basis': columns['cost_basis'],
+        'selling_price': columns['selling_price'],
+        'shelf_life_days': columns['shelf_life_days'],
+        'current_age_days': columns['current_age_days'],
+        'days_remaining': columns['days_remaining'],
+        'expiry_date': calculate_expiry_dates(columns['days_remaining']),
+        'sale_through_rate': columns['sale_through_rate'],
+        'avg_daily_sales': columns['avg_daily_sales'],
+        'last_week_sales': columns['last_week_sales'],
+        'store_location': columns['store_location'],
+        'store_type': columns['store_type'],
+        'store_size': columns['store_size'],
+        'supplier': columns['supplier']
+    })
+    
+    return convert_categorical_columns(df)
+
+def calculate_expiry_dates(days_remaining):
+    """
+    Format expiry dates (today + days remaining) as dd/mm/YYYY strings in one pass
+    """
+    today = pd.Timestamp('today').normalize()
+    expiry = today + pd.to_timedelta(np.asarray(days_remaining), unit='D')
+    return expiry.strftime('%d/%m/%Y').to_numpy()
 
 def ensure_realistic_financials(df):
     """
     Ensure that cost basis and selling price relationships are realistic
     This is a safety check for any data issues
     """
-    # Fix any cases where selling price might be lower than cost basis
-    mask = df['selling_price'] <= df['cost_basis']
-    if mask.any():
-        df.loc[mask, 'selling_price'] = df.loc[mask, 'cost_basis'] * np.random.uniform(1.3, 2.0, mask.sum())
-        df['selling_price'] = df['selling_price'].round(2)
+    cost_basis = df['cost_basis'].to_numpy(dtype=float)
+    # Own copy of the prices: repriced and rounded in place, then written back once
+    selling_price = df['selling_price'].to_numpy(dtype=float, copy=True)
     
-    # Ensure reasonable profit margins
-    df['gross_margin'] = (df['selling_price'] - df['cost_basis']) / df['selling_price']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross_margin = (selling_price - cost_basis) / selling_price
     
-    # Fix any unrealistic margins (too high or too low)
-    mask_high = df['gross_margin'] > 0.7  # More than 70% margin
-    mask_low = df['gross_margin'] < 0.1   # Less than 10% margin
+    # Rows to reprice and the range of the cost multiplier used for each case:
+    # selling at or below cost, more than 70% margin, less than 10% margin
+    conditions = [selling_price <= cost_basis, gross_margin > 0.7, gross_margin < 0.1]
+    low = np.select(conditions, [1.3, 1.3, 1.4], default=np.nan)
+    high = np.select(conditions, [2.0, 1.7, 2.0], default=np.nan)
+    reprice = ~np.isnan(low)
     
-    if mask_high.any():
-        df.loc[mask_high, 'selling_price'] = df.loc[mask_high, 'cost_basis'] * np.random.uniform(1.3, 1.7, mask_high.sum())
+    rng = np.random.default_rng(0)
+    selling_price[reprice] = cost_basis[reprice] * rng.uniform(low[reprice], high[reprice])
     
-    if mask_low.any():
-        df.loc[mask_low, 'selling_price'] = df.loc[mask_low, 'cost_basis'] * np.random.uniform(1.4, 2.0, mask_low.sum())
+    df['selling_price'] = np.round(selling_price, 2, out=selling_price)
     
-    df['selling_price'] = df['selling_price'].round(2)
-    df = df.drop('gross_margin', axis=1)  # Remove temporary column
+    return df
+
+def convert_categorical_columns(df):
+    """
+    Store repeated descriptor strings as categoricals (small integer codes)
+    """
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    
+    return df
+
+def downcast_numeric_columns(df):
+    """
+    Cast uploaded numeric columns to NUMERIC_DTYPES, leaving any integer column
+    whose values are fractional, missing or out of range at its parsed dtype
+    """
+    for column, dtype in NUMERIC_DTYPES.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            if (values.isna().any() or (values % 1 != 0).any()
+                    or values.min() < info.min or values.max() > info.max):
+                continue
+        df[column] = values.astype(dtype)
     
     return df
 
@@ -186,8 +228,7 @@ def validate_csv_data(df):
     
     # Calculate derived fields
     df['days_remaining'] = df['shelf_life_days'] - df['current_age_days']
-    df['expiry_date'] = pd.to_datetime('today') + pd.to_timedelta(df['days_remaining'], unit='D')
-    df['expiry_date'] = df['expiry_date'].dt.strftime('%d/%m/%Y')
+    df['expiry_date'] = calculate_expiry_dates(df['days_remaining'])
     
     # Fill missing optional fields
     if 'store_location' not in df.columns:
@@ -197,8 +238,11 @@ def validate_csv_data(df):
     if 'last_week_sales' not in df.columns:
         df['last_week_sales'] = df['avg_daily_sales'] * 7
     
+    df = convert_categorical_columns(df)
+    
     # Ensure realistic financial relationships
     df = ensure_realistic_financials(df)
+    df = downcast_numeric_columns(df)
     
     return df
 
@@ -1,141 +1,130 @@
 import pandas as pd
-from .reallocation import check_reallocation_viability
+import numpy as np
+from .risk_calculator import RISK_THRESHOLDS
 
-def get_primary_strategy(risk_score, category, can_reallocate, can_donate, days_remaining):
-    """
-    Main decision logic for primary strategy INCLUDING DONATE option
-    """
-    risk_level = get_risk_level_from_score(risk_score)
-    
-    # CRITICAL Risk (81-100%)
-    if risk_level == "CRITICAL":
-        if category == "Fresh Food":
-            if can_donate and days_remaining >= 1:  # At least 1 day for donation processing
-                return "DONATE"
-            else:
-                return "LIQUIDATE"
-        else:
-            return "LIQUIDATE"
-    
-    # HIGH Risk (61-80%)
-    elif risk_level == "HIGH":
-        if category == "Fresh Food":
-            if can_donate and days_remaining >= 2:  # Need 2 days for donation
-                return "DONATE"
-            elif can_reallocate and days_remaining >= 3:  # Combined strategy for Fresh Food
-                return "REALLOCATE+MARKDOWN"
-            else:
-                return "MARKDOWN"
-        else:
-            if can_reallocate and days_remaining >= 4:  # Combined strategy for other categories
-                return "REALLOCATE+MARKDOWN"
-            elif can_reallocate:
-                return "REALLOCATE"
-            else:
-                return "MARKDOWN"
-    
-    # MEDIUM Risk (41-60%)
-    elif risk_level == "MEDIUM":
-        if can_reallocate and days_remaining >= 5:  # Good candidate for combined approach
-            return "REALLOCATE+MARKDOWN"
-        elif can_reallocate:
-            return "REALLOCATE"
-        elif can_donate and category in ["Fresh Food", "Perishables"] and days_remaining >= 3:
-            return "DONATE"
-        else:
-            return "MARKDOWN"
-    
-    # LOW Risk (0-40%)
-    else:
-        return "NO ACTION"
+# Every primary recommendation the engine can produce
+STRATEGIES = ["NO ACTION", "MARKDOWN", "REALLOCATE", "REALLOCATE+MARKDOWN", "DONATE", "LIQUIDATE"]
+
+# Categories eligible for donation; their codes (0 = Fresh Food, 1 = Perishables)
+# stand in for string compares in the vectorized functions
+DONATABLE_CATEGORIES = ["Fresh Food", "Perishables"]
 
-def get_secondary_options(risk_score, category, can_reallocate, can_donate, primary_strategy, days_remaining):
+def get_primary_strategies(risk_score, category, can_reallocate, can_donate, days_remaining):
     """
-    Generate secondary options based on primary strategy
+    Main decision logic for primary strategy INCLUDING DONATE option, over whole columns
     """
-    options = []
-    
-    if primary_strategy != "REALLOCATE" and can_reallocate:
-        options.append("REALLOCATE")
-    
-    if primary_strategy != "DONATE" and can_donate and category in ["Fresh Food", "Perishables"] and days_remaining >= 1:
-        options.append("DONATE")
-    
-    if primary_strategy != "MARKDOWN":
-        options.append("MARKDOWN")
-    
-    if primary_strategy != "LIQUIDATE":
-        options.append("LIQUIDATE")
-    
-    return " | ".join(options) if options else "None"
+    level = np.searchsorted(RISK_THRESHOLDS, np.asarray(risk_score, dtype=float), side='left')
+    category_code = pd.Categorical(category, categories=DONATABLE_CATEGORIES).codes
+    is_fresh = category_code == 0
+    is_perishable = category_code >= 0
+    can_reallocate = np.asarray(can_reallocate, dtype=bool)
+    can_donate = np.asarray(can_donate, dtype=bool)
+    days_remaining = np.asarray(days_remaining)
+    
+    critical, high, medium = level == 3, level == 2, level == 1
+    
+    # Conditions run from CRITICAL (81-100%) down to MEDIUM (41-60%); LOW risk falls
+    # through to NO ACTION. np.select picks the first one that matches
+    conditions = [
+        critical & is_fresh & can_donate & (days_remaining >= 1),
+        critical,
+        high & is_fresh & can_donate & (days_remaining >= 2),
+        high & is_fresh & can_reallocate & (days_remaining >= 3),
+        high & is_fresh,
+        high & can_reallocate & (days_remaining >= 4),
+        high & can_reallocate,
+        high,
+        medium & can_reallocate & (days_remaining >= 5),
+        medium & can_reallocate,
+        medium & can_donate & is_perishable & (days_remaining >= 3),
+        medium,
+    ]
+    choices = [
+        "DONATE",
+        "LIQUIDATE",
+        "DONATE",
+        "REALLOCATE+MARKDOWN",
+        "MARKDOWN",
+        "REALLOCATE+MARKDOWN",
+        "REALLOCATE",
+        "MARKDOWN",
+        "REALLOCATE+MARKDOWN",
+        "REALLOCATE",
+        "DONATE",
+        "MARKDOWN",
+    ]
+    
+    # Select integer codes into STRATEGIES rather than strings
+    strategy_code = {name: code for code, name in enumerate(STRATEGIES)}
+    codes = np.select(
+        conditions,
+        [strategy_code[choice] for choice in choices],
+        default=strategy_code["NO ACTION"]
+    ).astype(np.int8)
+    
+    return pd.Categorical.from_codes(codes, categories=STRATEGIES)
 
-def can_donate_item(category, days_remaining, cost_basis):
+# Secondary options in display order; get_secondary_options_vectorized encodes
+# which of them apply to a row as one bit each
+SECONDARY_OPTIONS = ["REALLOCATE", "DONATE", "MARKDOWN", "LIQUIDATE"]
+SECONDARY_OPTION_LABELS = np.array([
+    " | ".join(option for bit, option in enumerate(SECONDARY_OPTIONS) if code & (1 << bit)) or "None"
+    for code in range(1 << len(SECONDARY_OPTIONS))
+], dtype=object)
+
+def get_secondary_options_vectorized(category, can_reallocate, can_donate, primary_strategy, days_remaining):
     """
-    Determine if item can be donated
+    Generate secondary options based on primary strategy, over whole columns
     """
-    # Donation criteria:
-    # 1. Must be Fresh Food or Perishables
-    # 2. Must have at least 1 day remaining
-    # 3. Must have reasonable value (cost >  $ 1)
-    
-    if category not in ["Fresh Food", "Perishables"]:
-        return False
-    
-    if days_remaining < 1:
-        return False
-    
-    if cost_basis < 1.0:  # Too low value items
-        return False
-    
-    return True
-
-def get_risk_level_from_score(risk_score):
-    """Convert risk score to risk level"""
-    if risk_score <= 40:
-        return "LOW"
-    elif risk_score <= 60:
-        return "MEDIUM"
-    elif risk_score <= 80:
-        return "HIGH"
-    else:
-        return "CRITICAL"
+    strategy_code = pd.Categorical(primary_strategy, categories=STRATEGIES).codes
+    is_perishable = pd.Categorical(category, categories=DONATABLE_CATEGORIES).codes >= 0
+    can_reallocate = np.asarray(can_reallocate, dtype=bool)
+    can_donate = np.asarray(can_donate, dtype=bool)
+    days_remaining = np.asarray(days_remaining)
+    
+    offered = [
+        (strategy_code != STRATEGIES.index("REALLOCATE")) & can_reallocate,
+        (strategy_code != STRATEGIES.index("DONATE")) & can_donate & is_perishable & (days_remaining >= 1),
+        strategy_code != STRATEGIES.index("MARKDOWN"),
+        strategy_code != STRATEGIES.index("LIQUIDATE"),
+    ]
+    code = np.zeros(len(strategy_code), dtype=np.intp)
+    for bit, mask in enumerate(offered):
+        code |= mask.astype(np.intp) << bit
+    
+    return pd.Categorical.from_codes(code, categories=SECONDARY_OPTION_LABELS)
 
 def add_decision_logic(df):
     """
     Add all decision logic to dataframe
     """
     # Add donation eligibility
-    df['can_donate'] = df.apply(
-        lambda row: can_donate_item(row['category'], row['days_remaining'], row['cost_basis']), 
-        axis=1
+    # Fresh Food or Perishables with at least 1 day left and cost basis of $1 or more
+    df['can_donate'] = (
+        df['category'].isin(DONATABLE_CATEGORIES)
+        & (df['days_remaining'] >= 1)
+        & (df['cost_basis'] >= 1.0)
     )
     
     # Add reallocation viability (this will be updated by reallocation module)
     df['can_reallocate'] = False
     
     # Add primary strategy
-    df['primary_recommendation'] = df.apply(
-        lambda row: get_primary_strategy(
-            row['risk_score'], 
-            row['category'], 
-            row['can_reallocate'], 
-            row['can_donate'],
-            row['days_remaining']
-        ), 
-        axis=1
+    df['primary_recommendation'] = get_primary_strategies(
+        df['risk_score'],
+        df['category'],
+        df['can_reallocate'],
+        df['can_donate'],
+        df['days_remaining']
     )
     
     # Add secondary options
-    df['secondary_options'] = df.apply(
-        lambda row: get_secondary_options(
-            row['risk_score'], 
-            row['category'], 
-            row['can_reallocate'], 
-            row['can_donate'],
-            row['primary_recommendation'],
-            row['days_remaining']
-        ), 
-        axis=1
+    df['secondary_options'] = get_secondary_options_vectorized(
+        df['category'],
+        df['can_reallocate'],
+        df['can_donate'],
+        df['primary_recommendation'],
+        df['days_remaining']
     )
     
     return df
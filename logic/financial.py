@@ -1,141 +1,87 @@
 import pandas as pd
 import numpy as np
+from .decision_engine import STRATEGIES
 
-def calculate_expected_recovery(row):
+# Fallbacks for frames that have not been through add_reallocation_details
+REALLOCATION_DEFAULTS = {
+    'reallocation_cost': 0.0,
+    'target_store_sell_through': 0.8
+}
+
+# Markdown bands for get_markdown_percentages: scores from each threshold up get the next step
+MARKDOWN_THRESHOLDS = np.array([40, 60, 80])
+MARKDOWN_STEPS = np.array([0, 15, 25, 30])
+
+def get_markdown_percentages(risk_score):
+    """
+    Markdown percentage for each risk score: 30 from 80, 25 from 60, 15 from 40, else 0
+    """
+    # side='right' keeps the lower band edges inclusive (40 -> 15, 60 -> 25, ...)
+    return MARKDOWN_STEPS[np.searchsorted(MARKDOWN_THRESHOLDS, risk_score, side='right')]
+
+def add_financial_calculations(df):
     """
-    Calculate expected recovery based on recommendation
+    Add all financial calculations to dataframe
     """
-    strategy = row['primary_recommendation']
-    selling_price = row['selling_price']
-    cost_basis = row['cost_basis']
-    quantity = row['quantity']
+    for column, default in REALLOCATION_DEFAULTS.items():
+        if column not in df.columns:
+            df[column] = default
     
-    if strategy == "NO ACTION":
-        # Expected revenue = selling_price * quantity * sell_through_rate
-        # Plus salvage value for unsold items
-        sold_quantity = quantity * row['sale_through_rate']
-        unsold_quantity = quantity * (1 - row['sale_through_rate'])
-        
-        # Revenue from sold items at full price
-        revenue_from_sales = sold_quantity * selling_price
-        
-        # Salvage value for unsold items (10% of selling price)
-        salvage_value = unsold_quantity * selling_price * 0.10
-        
-        return revenue_from_sales + salvage_value
+    n = len(df)
+    # Encode the strategy labels once so every mask below is an integer compare
+    strategy_code = pd.Categorical(df['primary_recommendation'], categories=STRATEGIES).codes
+    is_strategy = {name: strategy_code == code for code, name in enumerate(STRATEGIES)}
+    selling_price = df['selling_price'].to_numpy(dtype=float)
+    cost_basis = df['cost_basis'].to_numpy(dtype=float)
+    quantity = df['quantity'].to_numpy(dtype=float)
+    sale_through = df['sale_through_rate'].to_numpy(dtype=float)
+    risk_score = df['risk_score'].to_numpy(dtype=float)
+    reallocation_cost = df['reallocation_cost'].to_numpy(dtype=float)
+    target_sell_through = df['target_store_sell_through'].to_numpy(dtype=float)
     
-    elif strategy == "REALLOCATE":
-        # 95% of selling price minus transport costs
-        base_recovery = selling_price * 0.95 * quantity
-        transport_cost = row.get('reallocation_cost', 0)
-        # Factor in target store sell-through rate
-        target_sell_through = row.get('target_store_sell_through', 0.8)
-        return (base_recovery * target_sell_through) - transport_cost
+    markdown_pct = get_markdown_percentages(risk_score)
+    discounted_price = selling_price * (1 - markdown_pct / 100)
     
-    elif strategy == "MARKDOWN":
-        # Selling price minus markdown percentage
-        markdown_pct = get_markdown_percentage(row['risk_score'])
-        discounted_price = selling_price * (1 - markdown_pct/100)
-        return discounted_price * quantity
+    # Expected recovery: one formula per strategy, evaluated on that strategy's rows
+    expected_recovery = np.zeros(n)
     
-    elif strategy == "REALLOCATE+MARKDOWN":
-        # Combined strategy: Reallocate 70% of inventory, markdown the rest
-        reallocation_portion = 0.7
-        markdown_portion = 0.3
-        
-        # Reallocate calculation for 70% of inventory
-        realloc_quantity = quantity * reallocation_portion
-        base_recovery = selling_price * 0.95 * realloc_quantity
-        transport_cost = row.get('reallocation_cost', 0) * reallocation_portion
-        target_sell_through = row.get('target_store_sell_through', 0.8)
-        realloc_recovery = (base_recovery * target_sell_through) - transport_cost
-        
-        # Markdown calculation for 30% of inventory
-        markdown_quantity = quantity * markdown_portion
-        markdown_pct = get_markdown_percentage(row['risk_score'])
-        discounted_price = selling_price * (1 - markdown_pct/100)
-        markdown_recovery = discounted_price * markdown_quantity
-        
-        # Total recovery from both strategies
-        return realloc_recovery + markdown_recovery
+    m = is_strategy["NO ACTION"]
+    expected_recovery[m] = (quantity[m] * sale_through[m] * selling_price[m]
+                            + quantity[m] * (1 - sale_through[m]) * selling_price[m] * 0.10)
     
-    elif strategy == "DONATE":
-        # Tax deduction benefit (30% of cost basis)
-        return cost_basis * 0.30 * quantity
+    m = is_strategy["REALLOCATE"]
+    expected_recovery[m] = (selling_price[m] * 0.95 * quantity[m] * target_sell_through[m]) - reallocation_cost[m]
     
-    elif strategy == "LIQUIDATE":
-        # 30% of selling price
-        return selling_price * 0.30 * quantity
+    m = is_strategy["MARKDOWN"]
+    expected_recovery[m] = discounted_price[m] * quantity[m]
     
-    else:
-        return 0
-
-def get_markdown_percentage(risk_score):
-    """
-    Get markdown percentage based on risk score
-    """
-    if risk_score >= 80:
-        return 30
-    elif risk_score >= 60:
-        return 25
-    elif risk_score >= 40:
-        return 15
-    else:
-        return 0
-
-def calculate_potential_loss(row):
-    """
-    Calculate potential loss if no action is taken
-    """
-    # Potential loss = cost basis of items that won't sell
-    unsold_probability = 1 - row['sale_through_rate']
-    return row['cost_basis'] * row['quantity'] * unsold_probability
-
-def calculate_margin_impact(row):
-    """
-    Calculate margin impact (Revenue - Cost)
-    This should be positive for profitable scenarios
-    """
-    expected_revenue = row['expected_recovery']
-    total_cost = row['cost_basis'] * row['quantity']
+    m = is_strategy["REALLOCATE+MARKDOWN"]
+    realloc_recovery = (selling_price[m] * 0.95 * quantity[m] * 0.7 * target_sell_through[m]) - reallocation_cost[m] * 0.7
+    expected_recovery[m] = realloc_recovery + discounted_price[m] * quantity[m] * 0.3
     
-    # For reallocation, add transport cost to total cost
-    if row['primary_recommendation'] == "REALLOCATE" or row['primary_recommendation'] == "REALLOCATE+MARKDOWN":
-        transport_cost = row.get('reallocation_cost', 0)
-        # For combined strategy, only apply transport cost to the reallocated portion
-        if row['primary_recommendation'] == "REALLOCATE+MARKDOWN":
-            transport_cost = transport_cost * 0.7  # 70% of inventory is reallocated
-        total_cost += transport_cost
+    m = is_strategy["DONATE"]
+    expected_recovery[m] = cost_basis[m] * 0.30 * quantity[m]
     
-    return expected_revenue - total_cost
-
-def calculate_profit_margin_percentage(row):
-    """
-    Calculate profit margin percentage
-    """
-    if row['expected_recovery'] == 0:
-        return 0
+    m = is_strategy["LIQUIDATE"]
+    expected_recovery[m] = selling_price[m] * 0.30 * quantity[m]
     
-    total_cost = row['cost_basis'] * row['quantity']
+    # Total cost includes transport for the reallocated portion of the inventory
+    transport_cost = np.select(
+        [is_strategy["REALLOCATE"], is_strategy["REALLOCATE+MARKDOWN"]],
+        [reallocation_cost, reallocation_cost * 0.7],
+        default=0.0
+    )
+    total_cost = cost_basis * quantity + transport_cost
+    margin_impact = expected_recovery - total_cost
     
-    # Add transport costs for both REALLOCATE and REALLOCATE+MARKDOWN strategies
-    if row['primary_recommendation'] == "REALLOCATE" or row['primary_recommendation'] == "REALLOCATE+MARKDOWN":
-        transport_cost = row.get('reallocation_cost', 0)
-        # For combined strategy, only apply transport cost to the reallocated portion
-        if row['primary_recommendation'] == "REALLOCATE+MARKDOWN":
-            transport_cost = transport_cost * 0.7  # 70% of inventory is reallocated
-        total_cost += transport_cost
+    profit_margin_pct = np.zeros(n)
+    m = expected_recovery != 0
+    profit_margin_pct[m] = (margin_impact[m] / expected_recovery[m]) * 100
     
-    return ((row['expected_recovery'] - total_cost) / row['expected_recovery']) * 100
-
-def add_financial_calculations(df):
-    """
-    Add all financial calculations to dataframe
-    """
-    df['expected_recovery'] = df.apply(calculate_expected_recovery, axis=1)
-    df['potential_loss'] = df.apply(calculate_potential_loss, axis=1)
-    df['margin_impact'] = df.apply(calculate_margin_impact, axis=1)
-    df['profit_margin_pct'] = df.apply(calculate_profit_margin_percentage, axis=1)
-    df['markdown_percentage'] = df['risk_score'].apply(get_markdown_percentage)
+    df['expected_recovery'] = expected_recovery
+    df['potential_loss'] = cost_basis * quantity * (1 - sale_through)
+    df['margin_impact'] = margin_impact
+    df['profit_margin_pct'] = profit_margin_pct
+    df['markdown_percentage'] = markdown_pct.astype(np.int8)
     
     return df
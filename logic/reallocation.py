@@ -1,34 +1,57 @@
 import pandas as pd
 import numpy as np
+from .decision_engine import get_primary_strategies
 
-def check_reallocation_viability(row):
-    """
-    Check if item can be reallocated based on business rules
-    """
-    # Basic viability criteria
-    if row['days_remaining'] < 3:  # Need minimum 3 days for transport
-        return False, None, 0, 0
-    
-    if row['quantity'] < 5:  # Need minimum quantity for cost-effectiveness
-        return False, None, 0, 0
-    
-    # Fresh food needs more time
-    if row['category'] == "Fresh Food" and row['days_remaining'] < 2:
-        return False, None, 0, 0
-    
-    # Find best store for reallocation
-    best_store = find_best_reallocation_store(row)
-    
-    if best_store is None:
-        return False, None, 0, 0
-    
-    # Calculate reallocation cost
-    reallocation_cost = calculate_reallocation_cost(row, best_store)
-    
-    # Calculate expected store sell-through rate
-    store_sell_through = get_store_sell_through_rate(row['category'], best_store)
-    
-    return True, best_store, reallocation_cost, store_sell_through
+STORES = ['Store_A', 'Store_B', 'Store_C']
+CATEGORIES = ['Fresh Food', 'Perishables', 'General Goods']
+
+# Store compatibility matrix
+STORE_CAPABILITIES = {
+    'Store_A': ['Fresh Food', 'Perishables', 'General Goods'],  # Urban - accepts all
+    'Store_B': ['Perishables', 'General Goods'],                # Suburban - no fresh food
+    'Store_C': ['General Goods']                                # Rural - only general goods
+}
+
+# Priority order: Store_A (Urban) > Store_B (Suburban) > Store_C (Rural)
+STORE_PRIORITY = ['Store_A', 'Store_B', 'Store_C']
+
+BASE_COST_PER_UNIT = 0.50
+
+# Distance factor based on store combinations
+DISTANCE_FACTORS = {
+    ('Store_A', 'Store_B'): 1.2,
+    ('Store_A', 'Store_C'): 1.5,
+    ('Store_B', 'Store_A'): 1.2,
+    ('Store_B', 'Store_C'): 1.3,
+    ('Store_C', 'Store_A'): 1.5,
+    ('Store_C', 'Store_B'): 1.3,
+}
+
+# Category factor (fresh food costs more to transport)
+CATEGORY_FACTORS = {
+    'Fresh Food': 1.5,
+    'Perishables': 1.2,
+    'General Goods': 1.0
+}
+
+# Store performance matrix (different stores have different performance by category)
+STORE_PERFORMANCE = {
+    'Store_A': {  # Urban store - high performance
+        'Fresh Food': 0.85,
+        'Perishables': 0.80,
+        'General Goods': 0.75
+    },
+    'Store_B': {  # Suburban store - medium performance
+        'Fresh Food': 0.70,
+        'Perishables': 0.75,
+        'General Goods': 0.80
+    },
+    'Store_C': {  # Rural store - lower performance but good for general goods
+        'Fresh Food': 0.60,
+        'Perishables': 0.65,
+        'General Goods': 0.85
+    }
+}
 
 def find_best_reallocation_store(row):
     """
@@ -37,29 +60,19 @@ def find_best_reallocation_store(row):
     current_store = row['store_location']
     category = row['category']
     
-    # Store compatibility matrix
-    store_capabilities = {
-        'Store_A': ['Fresh Food', 'Perishables', 'General Goods'],  # Urban - accepts all
-        'Store_B': ['Perishables', 'General Goods'],                # Suburban - no fresh food
-        'Store_C': ['General Goods']                                # Rural - only general goods
-    }
-    
     # Available stores (excluding current store)
-    available_stores = [store for store in store_capabilities.keys() if store != current_store]
+    available_stores = [store for store in STORE_CAPABILITIES.keys() if store != current_store]
     
     # Find stores that can accept this category
     compatible_stores = []
     for store in available_stores:
-        if category in store_capabilities[store]:
+        if category in STORE_CAPABILITIES[store]:
             compatible_stores.append(store)
     
     if not compatible_stores:
         return None
     
-    # Priority order: Store_A (Urban) > Store_B (Suburban) > Store_C (Rural)
-    priority_order = ['Store_A', 'Store_B', 'Store_C']
-    
-    for store in priority_order:
+    for store in STORE_PRIORITY:
         if store in compatible_stores:
             return store
     
@@ -69,32 +82,12 @@ def calculate_reallocation_cost(row, target_store):
     """
     Calculate the cost of reallocating to target store
     """
-    base_cost_per_unit = 0.50
-    
-    # Distance factor based on store combinations
-    distance_factors = {
-        ('Store_A', 'Store_B'): 1.2,
-        ('Store_A', 'Store_C'): 1.5,
-        ('Store_B', 'Store_A'): 1.2,
-        ('Store_B', 'Store_C'): 1.3,
-        ('Store_C', 'Store_A'): 1.5,
-        ('Store_C', 'Store_B'): 1.3,
-    }
-    
     current_store = row['store_location']
-    distance_factor = distance_factors.get((current_store, target_store), 1.0)
-    
-    # Category factor (fresh food costs more to transport)
-    category_factors = {
-        'Fresh Food': 1.5,
-        'Perishables': 1.2,
-        'General Goods': 1.0
-    }
-    
-    category_factor = category_factors.get(row['category'], 1.0)
+    distance_factor = DISTANCE_FACTORS.get((current_store, target_store), 1.0)
+    category_factor = CATEGORY_FACTORS.get(row['category'], 1.0)
     
     # Total cost calculation
-    cost_per_unit = base_cost_per_unit * distance_factor * category_factor
+    cost_per_unit = BASE_COST_PER_UNIT * distance_factor * category_factor
     total_cost = cost_per_unit * row['quantity']
     
     return total_cost
@@ -103,56 +96,68 @@ def get_store_sell_through_rate(category, store):
     """
     Get expected sell-through rate for category at target store
     """
-    # Store performance matrix (different stores have different performance by category)
-    store_performance = {
-        'Store_A': {  # Urban store - high performance
-            'Fresh Food': 0.85,
-            'Perishables': 0.80,
-            'General Goods': 0.75
-        },
-        'Store_B': {  # Suburban store - medium performance
-            'Fresh Food': 0.70,
-            'Perishables': 0.75,
-            'General Goods': 0.80
-        },
-        'Store_C': {  # Rural store - lower performance but good for general goods
-            'Fresh Food': 0.60,
-            'Perishables': 0.65,
-            'General Goods': 0.85
-        }
-    }
-    
-    return store_performance.get(store, {}).get(category, 0.70)
+    return STORE_PERFORMANCE.get(store, {}).get(category, 0.70)
 
-def add_reallocation_details(df):
+def build_reallocation_tables():
     """
-    Add detailed reallocation information to dataframe
+    Materialize the store rules as arrays indexed by (current store, category) codes.
+    The extra last row stands for a current store outside the known network.
     """
-    reallocation_data = df.apply(check_reallocation_viability, axis=1, result_type='expand')
-    
-    df['can_reallocate'] = reallocation_data[0]
-    df['reallocation_store'] = reallocation_data[1]
-    df['reallocation_cost'] = reallocation_data[2]
-    df['target_store_sell_through'] = reallocation_data[3]
-    
-    # Update primary recommendation now that we have reallocation info
-    df['primary_recommendation'] = df.apply(
-        lambda row: get_updated_primary_strategy(row), 
-        axis=1
-    )
-    
-    return df
+    shape = (len(STORES) + 1, len(CATEGORIES))
+    best_target = np.full(shape, -1, dtype=np.int8)
+    unit_cost = np.zeros(shape)
+    sell_through = np.zeros(shape)
+    
+    for i, store in enumerate(STORES + [None]):
+        for j, category in enumerate(CATEGORIES):
+            row = {'store_location': store, 'category': category, 'quantity': 1}
+            target = find_best_reallocation_store(row)
+            if target is None:
+                continue
+            best_target[i, j] = STORES.index(target)
+            unit_cost[i, j] = calculate_reallocation_cost(row, target)
+            sell_through[i, j] = get_store_sell_through_rate(category, target)
+    
+    return best_target, unit_cost, sell_through
 
-def get_updated_primary_strategy(row):
+# Built once at import time; the store rules above are static
+BEST_TARGET, UNIT_COST, TARGET_SELL_THROUGH = build_reallocation_tables()
+
+def add_reallocation_details(df):
     """
-    Update primary strategy with reallocation information
+    Add detailed reallocation information to dataframe
     """
-    from .decision_engine import get_primary_strategy
+    # Integer codes into the lookup tables; unknown stores map to the extra row
+    store_code = pd.Categorical(df['store_location'], categories=STORES).codes
+    store_code = np.where(store_code < 0, len(STORES), store_code)
+    category_code = pd.Categorical(df['category'], categories=CATEGORIES).codes
+    known_category = category_code >= 0
+    category_code = np.where(known_category, category_code, 0)
+    
+    target = np.where(known_category, BEST_TARGET[store_code, category_code], -1)
+    days_remaining = df['days_remaining'].to_numpy()
+    quantity = df['quantity'].to_numpy()
+    is_fresh = (df['category'] == "Fresh Food").to_numpy()
+    
+    # Viable with 3+ days for transport and 5+ units, fresh food with 2+ days, and a compatible store
+    can_reallocate = (
+        (days_remaining >= 3)
+        & (quantity >= 5)
+        & ~(is_fresh & (days_remaining < 2))
+        & (target >= 0)
+    )
     
-    return get_primary_strategy(
-        row['risk_score'], 
-        row['category'], 
-        row['can_reallocate'], 
-        row['can_donate'],
-        row['days_remaining']
+    # All reallocation columns, plus the refreshed primary recommendation, in one update
+    return df.assign(
+        can_reallocate=can_reallocate,
+        reallocation_store=np.where(can_reallocate, np.array(STORES, dtype=object)[target], None),
+        reallocation_cost=np.where(can_reallocate, UNIT_COST[store_code, category_code] * quantity, 0.0),
+        target_store_sell_through=np.where(can_reallocate, TARGET_SELL_THROUGH[store_code, category_code], 0.0),
+        primary_recommendation=get_primary_strategies(
+            df['risk_score'],
+            df['category'],
+            can_reallocate,
+            df['can_donate'],
+            days_remaining
+        )
     )
@@ -1,54 +1,29 @@
 import pandas as pd
 import numpy as np
 
-def calculate_risk_score(row):
-    """
-    Calculate risk score based on time urgency and sales performance
-    """
-    # Time Factor: How much shelf life is left?
-    days_remaining = max(0, row['days_remaining'])
-    time_urgency = 1 - (days_remaining / row['shelf_life_days']) if row['shelf_life_days'] > 0 else 1
-    
-    # Sales Factor: How poorly is it selling?
-    sales_problem = 1 - row['sale_through_rate']
-    
-    # Combined Risk (0-100%)
-    risk_score = (time_urgency * 0.6) + (sales_problem * 0.4)
-    
-    return min(100, max(0, risk_score * 100))  # Ensure 0-100 range
-
-def get_risk_level(risk_score):
-    """
-    Convert risk score to risk level
-    """
-    if risk_score <= 40:
-        return "LOW"
-    elif risk_score <= 60:
-        return "MEDIUM"
-    elif risk_score <= 80:
-        return "HIGH"
-    else:
-        return "CRITICAL"
-
-def calculate_time_to_action(risk_score):
-    """
-    Calculate recommended time to take action
-    """
-    if risk_score <= 40:
-        return "7+ days"
-    elif risk_score <= 60:
-        return "3-7 days"
-    elif risk_score <= 80:
-        return "1-3 days"
-    else:
-        return "0-24 hours"
+# Upper bounds (inclusive) of the LOW, MEDIUM and HIGH bands; anything above is CRITICAL
+RISK_THRESHOLDS = np.array([40, 60, 80])
+RISK_LEVELS = np.array(["LOW", "MEDIUM", "HIGH", "CRITICAL"])
+TIME_TO_ACTION = np.array(["7+ days", "3-7 days", "1-3 days", "0-24 hours"])
 
 def add_risk_calculations(df):
     """
     Add all risk-related calculations to dataframe
     """
-    df['risk_score'] = df.apply(calculate_risk_score, axis=1)
-    df['risk_level'] = df['risk_score'].apply(get_risk_level)
-    df['time_to_action'] = df['risk_score'].apply(calculate_time_to_action)
+    days_remaining = df['days_remaining'].clip(lower=0).to_numpy(dtype=float)
+    shelf_life = df['shelf_life_days'].to_numpy(dtype=float)
+    
+    # Risk score = 60% time urgency + 40% sales problem, clipped to 0-100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        time_urgency = np.where(shelf_life > 0, 1 - days_remaining / shelf_life, 1.0)
+    sales_problem = 1 - df['sale_through_rate'].to_numpy(dtype=float)
+    risk_score = np.clip((time_urgency * 0.6 + sales_problem * 0.4) * 100, 0, 100)
+    
+    # side='left' keeps the band edges inclusive (40 -> LOW, 60 -> MEDIUM, ...)
+    level_idx = np.searchsorted(RISK_THRESHOLDS, risk_score, side='left')
+    
+    df['risk_score'] = risk_score
+    df['risk_level'] = pd.Categorical.from_codes(level_idx, categories=RISK_LEVELS, ordered=True)
+    df['time_to_action'] = pd.Categorical.from_codes(level_idx, categories=TIME_TO_ACTION, ordered=True)
     
     return df
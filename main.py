@@ -1,16 +1,13 @@
+import io
+from functools import partial
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-
-# Import custom modules
-from data.sample_data import generate_sample_data, validate_csv_data
-from logic.risk_calculator import add_risk_calculations
-from logic.decision_engine import add_decision_logic
-from logic.reallocation import add_reallocation_details
-from logic.financial import add_financial_calculations
+
+# Import custom modules; the data and logic modules are imported lazily by the
+# dashboard loaders, and plotly.express by the Problem Statement charts, since the
+# text-only pages never need them (streamlit already loads plotly.graph_objects)
 from utils.helpers import (
     create_risk_distribution_chart,
     create_recommendation_chart,
@@ -20,7 +17,9 @@ from utils.helpers import (
     format_percentage,
     get_risk_color,
     get_recommendation_color,
-    create_summary_metrics
+    create_summary_metrics,
+    get_recommendation_stats,
+    count_risk_by_category
 )
 
 # Page configuration
@@ -31,8 +30,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling; only the classes the pages actually use
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -41,24 +40,130 @@ st.markdown("""
         color: #1f77b4;
         margin-bottom: 2rem;
     }
-    .metric-container {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    .risk-LOW { background-color: #d4edda; }
-    .risk-MEDIUM { background-color: #fff3cd; }
-    .risk-HIGH { background-color: #f8d7da; }
-    .risk-CRITICAL { background-color: #f5c6cb; }
-    .recommendation-card {
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 0.5rem;
-        border: 1px solid #dee2e6;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+# Color-coded risk labels for the dashboard tables
+RISK_LEVEL_BADGES = {
+    'LOW': '🟢 LOW',
+    'MEDIUM': '🟡 MEDIUM',
+    'HIGH': '🟠 HIGH',
+    'CRITICAL': '🔴 CRITICAL'
+}
+
+# Float ratio and score columns added by the logic modules; the money columns
+# stay float64 so the per-recommendation totals add up to the cent
+DERIVED_FLOAT_COLUMNS = ['risk_score', 'target_store_sell_through', 'profit_margin_pct']
+
+# Item fields shown in the scenario panel's "Current Situation" column
+SITUATION_FIELDS = [
+    'product_name', 'category', 'quantity', 'days_remaining',
+    'risk_level', 'risk_score', 'sale_through_rate'
+]
+
+# Client-side formatting for the item analysis table
+ITEM_TABLE_COLUMN_CONFIG = {
+    'risk_score': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.1f"),
+    'cost_basis': st.column_config.NumberColumn(format="$%.2f"),
+    'selling_price': st.column_config.NumberColumn(format="$%.2f"),
+    'expected_recovery': st.column_config.NumberColumn(format="$%.2f"),
+    'margin_impact': st.column_config.NumberColumn(format="$%.2f")
+}
+
+# Rows sent to the browser per table page
+TABLE_PAGE_SIZE = 200
+
+# Decimal places for numeric columns in the dashboard tables
+ROUND_SPEC = {
+    'cost_basis': 2,
+    'selling_price': 2,
+    'reallocation_cost': 2,
+    'target_store_sell_through': 3,
+    'sale_through_rate': 3,
+    'expected_recovery': 2,
+    'margin_impact': 2
+}
+
+# Display names for the recommendation tables
+RENAME_MAP = {
+    'store_location': 'Store ID',
+    'cost_basis': 'Cost Basis ( $ )',
+    'selling_price': 'Selling Price ( $ )',
+    'sale_through_rate': 'Store Sell-Through Rate',
+    'expected_recovery': 'Expected Recovery ( $ )',
+    'margin_impact': 'Margin Impact ( $ )',
+    'markdown_percentage': 'Markdown %'
+}
+
+REALLOCATION_RENAME_MAP = {
+    **RENAME_MAP,
+    'store_location': 'Current Store',
+    'reallocation_store': 'Target Store',
+    'reallocation_cost': 'Transport Cost ( $ )',
+    'target_store_sell_through': 'Target Store Rate',
+    'sale_through_rate': 'Current Store Rate'
+}
+
+DONATION_RENAME_MAP = {
+    **RENAME_MAP,
+    'sale_through_rate': 'Current Store Rate',
+    'expected_recovery': 'Tax Benefit ( $ )',
+    'margin_impact': 'Net Impact ($)'
+}
+
+RENAME_MAP_BY_REC = {
+    'REALLOCATE': REALLOCATION_RENAME_MAP,
+    'DONATE': DONATION_RENAME_MAP
+}
+
+# Columns shown in each recommendation table; anything not listed uses the standard set
+STANDARD_DISPLAY_COLUMNS = [
+    'sku', 'product_name', 'category', 'store_location',
+    'quantity', 'risk_level', 'days_remaining', 'cost_basis', 'selling_price', 'sale_through_rate',
+    'expected_recovery', 'margin_impact'
+]
+
+DISPLAY_COLS_BY_REC = {
+    'REALLOCATE': [
+        'sku', 'product_name', 'category', 'store_location',
+        'quantity', 'risk_level', 'days_remaining', 'cost_basis', 'selling_price',
+        'reallocation_store', 'reallocation_cost', 'target_store_sell_through',
+        'sale_through_rate', 'expected_recovery', 'margin_impact'
+    ],
+    'DONATE': [
+        'sku', 'product_name', 'category', 'store_location',
+        'quantity', 'days_remaining', 'cost_basis', 'selling_price', 'sale_through_rate',
+        'expected_recovery', 'margin_impact'
+    ],
+    'MARKDOWN': STANDARD_DISPLAY_COLUMNS + ['markdown_percentage']
+}
+
+# Static HTML for the Problem Statement page
+HERO_HTML = """
+<div style="text-align: center; padding: 2rem 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 15px; margin-bottom: 2rem;">
+    <h1 style="font-size: 3rem; margin: 0;">📊 Shrink Sense Dashboard</h1>
+    <p style="font-size: 1.2rem; margin: 0.5rem 0 0 0;">Transform Inventory Loss into Profit Opportunity</p>
+</div>
+"""
+
+SHRINK_CAUSE_CARD = """
+<div style="text-align: center; padding: 1.5rem; background: {color}; color: white; border-radius: 10px; margin-bottom: 1rem;">
+    <h3 style="margin: 0;">{icon}</h3>
+    <p style="margin: 0.5rem 0 0 0;"><strong>{title}</strong></p>
+    <p style="margin: 0; font-size: 0.9rem;">{description}</p>
+</div>
+"""
+
+SHRINK_CAUSE_CARDS = [
+    SHRINK_CAUSE_CARD.format(color=color, icon=icon, title=title, description=description)
+    for color, icon, title, description in [
+        ('#ff6b6b', '⏰', 'Product Expiration', 'Time-sensitive items spoil'),
+        ('#4ecdc4', '📉', 'Poor Sales', 'Slow-moving inventory'),
+        ('#45b7d1', '🌡️', 'Spoilage', 'Quality degradation'),
+        ('#f7b731', '💸', 'Lost Opportunity', 'Wasted shelf space')
+    ]
+]
 
 def main():
     # Header
@@ -81,19 +186,92 @@ def main():
         show_logic_explanation()
     elif page == "🚀 Future Improvements":
         show_future_improvements()
+
+@st.cache_resource
+def create_shrinkage_cost_chart():
+    """Pie chart of the cost layers behind an expired product (static, built once per process)"""
+    import plotly.express as px
+    
+    data = pd.DataFrame({
+        'Category': ['Direct Cost Loss', 'Lost Margin', 'Disposal Costs', 'Opportunity Cost'],
+        'Impact': [40, 30, 15, 15]
+    })
+    
+    fig = px.pie(
+        data, 
+        values='Impact', 
+        names='Category',
+        title='Financial Impact Breakdown',
+        color_discrete_sequence=['#ff6b6b', '#4ecdc4', '#45b7d1', '#f7b731']
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label', textfont_size=12)
+    fig.update_layout(
+        font=dict(size=14),
+        title_font_size=16,
+        title_x=0.5,
+        height=400
+    )
+    return fig
+
+@st.cache_resource
+def create_recovery_window_chart():
+    """Line chart of value recovery potential vs. days to expiry (static, built once per process)"""
+    import plotly.express as px
+    
+    challenge_data = pd.DataFrame({
+        'Days Until Expiration': [10, 7, 5, 3, 1, 0],
+        'Value Recovery Potential': [95, 85, 70, 50, 25, 0]
+    })
+    
+    fig = px.line(
+        challenge_data, 
+        x='Days Until Expiration', 
+        y='Value Recovery Potential',
+        title='The Shrinking Window of Opportunity',
+        markers=True,
+        render_mode='webgl'
+    )
+    
+    fig.update_traces(line=dict(color='#e74c3c', width=4), marker=dict(size=10))
+    fig.update_layout(
+        xaxis_title='Days Until Expiration',
+        yaxis_title='Value Recovery Potential (%)',
+        height=400
+    )
+    return fig
+
+@st.cache_resource
+def create_strategy_comparison_chart():
+    """Bar chart of value recovery by strategy (static, built once per process)"""
+    import plotly.express as px
+    
+    strategy_data = pd.DataFrame({
+        'Strategy': ['No Action', 'Markdown Only', 'Reallocate Only', 'Reallocate + Markdown', 'Donation', 'Liquidation'],
+        'Value Recovery %': [0, 65, 75, 85, 30, 25]
+    })
+    
+    fig = px.bar(
+        strategy_data, 
+        x='Strategy', 
+        y='Value Recovery %',
+        title='Value Recovery by Strategy',
+        color='Value Recovery %',
+        color_continuous_scale='RdYlGn'
+    )
+    
+    fig.update_traces(cliponaxis=False)
+    fig.update_layout(
+        xaxis_title='Strategy',
+        yaxis_title='Value Recovery (%)',
+        height=400
+    )
+    return fig
+
 def show_problem_statement():
     """Display detailed problem statement with illustrations"""
-    import plotly.express as px
-    import plotly.graph_objects as go
-    import pandas as pd
     
     # Hero section with title and subtitle
-    st.markdown("""
-    <div style="text-align: center; padding: 2rem 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 15px; margin-bottom: 2rem;">
-        <h1 style="font-size: 3rem; margin: 0;">📊 Shrink Sense Dashboard</h1>
-        <p style="font-size: 1.2rem; margin: 0.5rem 0 0 0;">Transform Inventory Loss into Profit Opportunity</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
     
     # What is inventory shrinkage - with visual appeal
     st.markdown("""
@@ -103,43 +281,8 @@ def show_problem_statement():
     """)
     
     # Visual representation of shrinkage causes
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div style="text-align: center; padding: 1.5rem; background: #ff6b6b; color: white; border-radius: 10px; margin-bottom: 1rem;">
-            <h3 style="margin: 0;">⏰</h3>
-            <p style="margin: 0.5rem 0 0 0;"><strong>Product Expiration</strong></p>
-            <p style="margin: 0; font-size: 0.9rem;">Time-sensitive items spoil</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div style="text-align: center; padding: 1.5rem; background: #4ecdc4; color: white; border-radius: 10px; margin-bottom: 1rem;">
-            <h3 style="margin: 0;">📉</h3>
-            <p style="margin: 0.5rem 0 0 0;"><strong>Poor Sales</strong></p>
-            <p style="margin: 0; font-size: 0.9rem;">Slow-moving inventory</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div style="text-align: center; padding: 1.5rem; background: #45b7d1; color: white; border-radius: 10px; margin-bottom: 1rem;">
-            <h3 style="margin: 0;">🌡️</h3>
-            <p style="margin: 0.5rem 0 0 0;"><strong>Spoilage</strong></p>
-            <p style="margin: 0; font-size: 0.9rem;">Quality degradation</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div style="text-align: center; padding: 1.5rem; background: #f7b731; color: white; border-radius: 10px; margin-bottom: 1rem;">
-            <h3 style="margin: 0;">💸</h3>
-            <p style="margin: 0.5rem 0 0 0;"><strong>Lost Opportunity</strong></p>
-            <p style="margin: 0; font-size: 0.9rem;">Wasted shelf space</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, card_html in zip(st.columns(4), SHRINK_CAUSE_CARDS):
+        col.markdown(card_html, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -161,27 +304,7 @@ def show_problem_statement():
         st.error("⏰ **Opportunity Cost (15%)**\n\nShelf space that could have generated profit")
     
     with col2:
-        # Create pie chart with proper data
-        data = pd.DataFrame({
-            'Category': ['Direct Cost Loss', 'Lost Margin', 'Disposal Costs', 'Opportunity Cost'],
-            'Impact': [40, 30, 15, 15]
-        })
-        
-        fig = px.pie(
-            data, 
-            values='Impact', 
-            names='Category',
-            title='Financial Impact Breakdown',
-            color_discrete_sequence=['#ff6b6b', '#4ecdc4', '#45b7d1', '#f7b731']
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label', textfont_size=12)
-        fig.update_layout(
-            font=dict(size=14),
-            title_font_size=16,
-            title_x=0.5,
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(create_shrinkage_cost_chart(), use_container_width=True)
     
     # Real-world example using streamlit components
     st.markdown("""
@@ -218,27 +341,7 @@ def show_problem_statement():
     """)
     
     # Challenge visualization with timeline
-    challenge_data = pd.DataFrame({
-        'Days Until Expiration': [10, 7, 5, 3, 1, 0],
-        'Value Recovery Potential': [95, 85, 70, 50, 25, 0]
-    })
-    
-    fig = px.line(
-        challenge_data, 
-        x='Days Until Expiration', 
-        y='Value Recovery Potential',
-        title='The Shrinking Window of Opportunity',
-        markers=True
-    )
-    
-    fig.update_traces(line=dict(color='#e74c3c', width=4), marker=dict(size=10))
-    fig.update_layout(
-        xaxis_title='Days Until Expiration',
-        yaxis_title='Value Recovery Potential (%)',
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(create_recovery_window_chart(), use_container_width=True)
     
     st.markdown("---")
     
@@ -293,27 +396,7 @@ def show_problem_statement():
     **See how different strategies stack up in terms of value recovery:**
     """)
     
-    strategy_data = pd.DataFrame({
-        'Strategy': ['No Action', 'Markdown Only', 'Reallocate Only', 'Reallocate + Markdown', 'Donation', 'Liquidation'],
-        'Value Recovery %': [0, 65, 75, 85, 30, 25]
-    })
-    
-    fig = px.bar(
-        strategy_data, 
-        x='Strategy', 
-        y='Value Recovery %',
-        title='Value Recovery by Strategy',
-        color='Value Recovery %',
-        color_continuous_scale='RdYlGn'
-    )
-    
-    fig.update_layout(
-        xaxis_title='Strategy',
-        yaxis_title='Value Recovery (%)',
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(create_strategy_comparison_chart(), use_container_width=True)
     
     # Business value metrics using streamlit metrics
     st.markdown("""
@@ -368,21 +451,21 @@ def show_dashboard():
         ["Generate Sample Data", "Upload CSV File"]
     )
     
+    # expiry_date is stamped from today's date, so the cached data is keyed on it
+    today = datetime.now().date()
+    
     # Load data based on selection
     if data_source == "Generate Sample Data":
         num_items = st.sidebar.slider("Number of items to generate:", 10, 100, 20)
         
-        if st.sidebar.button("Generate New Data"):
-            st.session_state['data_generated'] = True
-        
-        if st.sidebar.button("Refresh Data") or 'data_generated' not in st.session_state:
-            st.session_state['data_generated'] = True
+        # A new seed generates a fresh data set; each seed's data stays cached
+        if st.sidebar.button("Refresh Data"):
+            st.session_state.data_seed = st.session_state.get('data_seed', 42) + 1
         
-        if st.session_state.get('data_generated', False):
-            with st.spinner("Generating sample data..."):
-                df = generate_sample_data(num_items)
-                df = process_data(df)
-                display_dashboard(df)
+        with st.spinner("Generating sample data..."):
+            seed = st.session_state.get('data_seed', 42)
+            df = load_sample_data(num_items, seed, today)
+        display_dashboard(df, ('sample', num_items, seed, today))
     
     else:
         uploaded_file = st.sidebar.file_uploader(
@@ -393,214 +476,118 @@ def show_dashboard():
         
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
-                df = validate_csv_data(df)
-                df = process_data(df)
+                df = load_uploaded_data(uploaded_file.getvalue(), today)
                 st.success("Data uploaded successfully!")
-                display_dashboard(df)
+                display_dashboard(df, ('upload', uploaded_file.file_id, today))
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
                 st.info("Please ensure your CSV has the required columns: sku, product_name, category, quantity, cost_basis, selling_price, shelf_life_days, current_age_days, sale_through_rate")
 
 def process_data(df):
     """Process data through all logic modules"""
+    from logic.risk_calculator import add_risk_calculations
+    from logic.decision_engine import add_decision_logic
+    from logic.reallocation import add_reallocation_details
+    from logic.financial import add_financial_calculations
+    
     df = add_risk_calculations(df)
     df = add_decision_logic(df)
     df = add_reallocation_details(df)
     df = add_financial_calculations(df)
-    return df
-
-def display_dashboard(df):
-    """Display the main dashboard"""
-    
-    # Summary metrics
-    metrics = create_summary_metrics(df)
-    
-    st.subheader("📈 Key Metrics")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Total Items",
-            metrics['total_items'],
-            help="Total inventory items analyzed"
-        )
-    
-    with col2:
-        st.metric(
-            "Critical Items",
-            metrics['critical_items'],
-            delta=f"{metrics['critical_items']/metrics['total_items']*100:.1f}%",
-            help="Items requiring immediate action"
-        )
     
-    with col3:
-        st.metric(
-            "Total Value at Risk",
-            format_currency(metrics['total_value']),
-            help="Total value that could be lost without action"
-        )
+    # The derived ratios and scores only feed display and export, where float32
+    # is plenty and halves what st.dataframe and the downloads have to serialize
+    df[DERIVED_FLOAT_COLUMNS] = df[DERIVED_FLOAT_COLUMNS].astype(np.float32)
     
-    with col4:
-        st.metric(
-            "Expected Recovery",
-            format_currency(metrics['expected_recovery']),
-            delta=f"{metrics['recovery_rate']:.1f}%",
-            help="Expected value recovery with recommendations"
-        )
-    
-    # Charts section
-    st.subheader("📊 Analysis Charts")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.plotly_chart(create_risk_distribution_chart(df), use_container_width=True)
-        st.plotly_chart(create_category_risk_heatmap(df), use_container_width=True)
+    # Sorted by SKU so single items can be found with a binary search
+    return df.sort_values('sku', kind='stable', ignore_index=True)
+
+@st.cache_data(show_spinner=False, ttl="1d")
+def load_sample_data(num_items, seed, today):
+    """Generate and process sample data; cached per item count, seed and day across reruns"""
+    from data.sample_data import generate_sample_data
     
-    with col2:
-        st.plotly_chart(create_recommendation_chart(df), use_container_width=True)
-        st.plotly_chart(create_financial_impact_chart(df), use_container_width=True)
+    return process_data(generate_sample_data(num_items, seed))
 
+@st.cache_data(show_spinner=False, ttl="1d")
+def load_uploaded_data(file_bytes, today):
+    """Validate and process an uploaded CSV; cached on the file contents and day"""
+    from data.sample_data import validate_csv_data
+    
+    # Arrow's multithreaded parser; string columns come back Arrow-backed
+    df = pd.read_csv(io.BytesIO(file_bytes), engine='pyarrow')
+    df = validate_csv_data(df)
+    return process_data(df)
 
-    st.subheader("🎯 Detailed Recommendations Summary")
-    
-    # Group by recommendation with more detailed info
-    recommendation_groups = df.groupby('primary_recommendation')
-    
-    for recommendation, group_df in recommendation_groups:
-        count = len(group_df)
-        total_quantity = group_df['quantity'].sum()
-        total_potential_loss = group_df['potential_loss'].sum()
-        total_expected_recovery = group_df['expected_recovery'].sum()
-        total_margin_impact = group_df['margin_impact'].sum()
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(data_key, filters, _df):
+    """CSV export of a frame, cached per data set and filters so the frame itself isn't hashed"""
+    return _df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data(show_spinner=False)
+def to_parquet_bytes(data_key, filters, _df):
+    """Parquet export of a frame: columnar and typed, much faster to write than CSV"""
+    buffer = io.BytesIO()
+    _df.to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
+    return buffer.getvalue()
+
+def filter_mask(df, filters):
+    """
+    AND together the active (column, value) filters; "All" leaves a column unfiltered.
+    With no active filter this is slice(None), which selects every row without a scan.
+    The filtered columns are categorical, so each test compares the int8 codes.
+    """
+    active = [(column, value) for column, value in filters if value != "All"]
+    if not active:
+        return slice(None)
+    
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in active:
+        values = df[column].cat
+        mask &= values.codes.to_numpy() == values.categories.get_loc(value)
+    return mask
+
+def situation_markdown(fields):
+    """'Current Situation' panel for one item from its SITUATION_FIELDS values"""
+    product_name, category, quantity, days_remaining, risk_level, risk_score, sale_through_rate = fields
+    return "\n".join([
+        "**Current Situation:**",
+        f"- Product: {product_name}",
+        f"- Category: {category}",
+        f"- Quantity: {quantity}",
+        f"- Days Remaining: {days_remaining}",
+        f"- Risk Level: {risk_level}",
+        f"- Risk Score: {risk_score:.1f}%",
+        f"- Sale Through Rate: {sale_through_rate:.2f}"
+    ])
+
+def render_table(table, key, column_config=None):
+    """Render one TABLE_PAGE_SIZE page of the table, with a page picker for longer tables"""
+    n_pages = -(-len(table) // TABLE_PAGE_SIZE)
+    page = 1
+    if n_pages > 1:
+        # The table may have shrunk (e.g. a new filter) since the page was picked
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = n_pages
         
-        with st.expander(f"📋 {recommendation} - {count} items ({total_quantity:.0f} units)"):
-            
-            # Summary metrics for this recommendation
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Quantity", f"{total_quantity:.0f}")
-            with col2:
-                st.metric("Potential Loss", format_currency(total_potential_loss))
-            with col3:
-                st.metric("Expected Recovery", format_currency(total_expected_recovery))
-            with col4:
-                st.metric("Margin Impact", format_currency(total_margin_impact))
-            
-            # Detailed table for this recommendation
-            if recommendation == "REALLOCATE":
-                # Special handling for reallocation with all details
-                display_columns = [
-                    'sku', 'product_name', 'category', 'store_location', 
-                    'quantity', 'risk_level', 'days_remaining', 'cost_basis', 'selling_price',
-                    'reallocation_store', 'reallocation_cost', 'target_store_sell_through',
-                    'sale_through_rate', 'expected_recovery', 'margin_impact'
-                ]
-                
-                # Later in the code where columns are renamed
-                display_df = display_df.rename(columns={
-                    'store_location': 'Current Store',
-                    'cost_basis': 'Cost Basis ( $ )',
-                    'selling_price': 'Selling Price ( $ )',
-                    'reallocation_store': 'Target Store',
-                    'reallocation_cost': 'Transport Cost ( $ )',
-                    'target_store_sell_through': 'Target Store Rate',
-                    'sale_through_rate': 'Current Store Rate',
-                    'expected_recovery': 'Expected Recovery ( $ )',
-                    'margin_impact': 'Margin Impact ( $ )'
-                })
-                
-                st.dataframe(display_df, use_container_width=True)
-                
-                # Additional insights for reallocation
-                st.write("**Reallocation Insights:**")
-                avg_transport_cost = group_df['reallocation_cost'].mean()
-                avg_target_rate = group_df['target_store_sell_through'].mean()
-                avg_current_rate = group_df['sale_through_rate'].mean()
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Avg Transport Cost", f"${avg_transport_cost:.2f}")
-                with col2:
-                    st.metric("Avg Target Store Rate", f"{avg_target_rate:.1%}")
-                with col3:
-                    st.metric("Avg Current Store Rate", f"{avg_current_rate:.1%}")
-                
-            elif recommendation == "DONATE":
-                # Special handling for donation
-                display_columns = [
-                    'sku', 'product_name', 'category', 'store_location',
-                    'quantity', 'days_remaining', 'cost_basis', 'selling_price', 'sale_through_rate',
-                    'expected_recovery', 'margin_impact'
-                ]
-                
-                display_df = group_df[display_columns].copy()
-                display_df['cost_basis'] = display_df['cost_basis'].round(2)
-                display_df['sale_through_rate'] = display_df['sale_through_rate'].round(3)
-                display_df['expected_recovery'] = display_df['expected_recovery'].round(2)
-                display_df['margin_impact'] = display_df['margin_impact'].round(2)
-                
-                # Rename columns for better display
-                display_df = display_df.rename(columns={
-                    'store_location': 'Store ID',
-                    'cost_basis': 'Cost Basis ( $ )',
-                    'selling_price': 'Selling Price ( $ )',
-                    'sale_through_rate': 'Current Store Rate',
-                    'expected_recovery': 'Tax Benefit ( $ )',
-                    'margin_impact': 'Net Impact ($)'
-                })
-                
-                st.dataframe(display_df, use_container_width=True)
-                
-                # Additional insights for donation
-                st.write("**Donation Insights:**")
-                total_tax_benefit = group_df['expected_recovery'].sum()
-                total_cost_basis = (group_df['cost_basis'] * group_df['quantity']).sum()
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Total Tax Benefit", f"${total_tax_benefit:.2f}")
-                with col2:
-                    st.metric("Total Cost Basis", f"${total_cost_basis:.2f}")
-                
-            else:
-                # Standard display for other recommendations
-                display_columns = [
-                    'sku', 'product_name', 'category', 'store_location',
-                    'quantity', 'risk_level', 'days_remaining', 'cost_basis', 'selling_price', 'sale_through_rate',
-                    'expected_recovery', 'margin_impact'
-                ]
-                
-                if recommendation == "MARKDOWN":
-                    display_columns.append('markdown_percentage')
-                
-                display_df = group_df[display_columns].copy()
-                display_df['sale_through_rate'] = display_df['sale_through_rate'].round(3)
-                display_df['expected_recovery'] = display_df['expected_recovery'].round(2)
-                display_df['margin_impact'] = display_df['margin_impact'].round(2)
-                display_df['cost_basis'] = display_df['cost_basis'].round(2)
-                display_df['selling_price'] = display_df['selling_price'].round(2)
-                
-                # Rename columns for better display
-                display_df = display_df.rename(columns={
-                    'store_location': 'Store ID',
-                    'cost_basis': 'Cost Basis ( $ )',
-                    'selling_price': 'Selling Price ( $ )',
-                    'sale_through_rate': 'Store Sell-Through Rate',
-                    'expected_recovery': 'Expected Recovery ( $ )',
-                    'margin_impact': 'Margin Impact ( $ )'
-                })
-                
-                if recommendation == "MARKDOWN":
-                    display_df = display_df.rename(columns={
-                        'markdown_percentage': 'Markdown %'
-                    })
-                
-                st.dataframe(display_df, use_container_width=True)
+        page = st.number_input(
+            f"Page (of {n_pages}, {len(table)} rows)",
+            min_value=1,
+            max_value=n_pages,
+            key=page_key
+        )
     
-    # Detailed item analysis
+    start = (page - 1) * TABLE_PAGE_SIZE
+    shown = table.iloc[start:start + TABLE_PAGE_SIZE]
+    st.dataframe(shown, use_container_width=True, column_config=column_config)
+
+@st.fragment
+def render_item_analysis(df, labeled_df, data_key):
+    """
+    Filterable item table and downloads. As a fragment, changing a filter or
+    page reruns only this section, not the charts and recommendation groups.
+    """
     st.subheader("📋 Detailed Item Analysis")
     
     # Filter options
@@ -609,562 +596,660 @@ def display_dashboard(df):
     with col1:
         risk_filter = st.selectbox(
             "Filter by Risk Level:",
-            ["All"] + list(df['risk_level'].unique())
+            ["All"] + df['risk_level'].cat.categories.tolist(),
+            key="risk_filter"
         )
     
     with col2:
         category_filter = st.selectbox(
             "Filter by Category:",
-            ["All"] + list(df['category'].unique())
+            ["All"] + df['category'].cat.categories.tolist(),
+            key="category_filter"
         )
     
     with col3:
         recommendation_filter = st.selectbox(
             "Filter by Recommendation:",
-            ["All"] + list(df['primary_recommendation'].unique())
+            ["All"] + df['primary_recommendation'].cat.categories.tolist(),
+            key="recommendation_filter"
         )
     
-    # Apply filters
-    filtered_df = df.copy()
-    
-    if risk_filter != "All":
-        filtered_df = filtered_df[filtered_df['risk_level'] == risk_filter]
-    
-    if category_filter != "All":
-        filtered_df = filtered_df[filtered_df['category'] == category_filter]
+    # Apply filters as one combined mask
+    filters = (
+        ('risk_level', risk_filter),
+        ('category', category_filter),
+        ('primary_recommendation', recommendation_filter)
+    )
+    mask = filter_mask(df, filters)
     
-    if recommendation_filter != "All":
-        filtered_df = filtered_df[filtered_df['primary_recommendation'] == recommendation_filter]
+    filtered_df = df[mask]
     
     # Display filtered results
     st.write(f"Showing {len(filtered_df)} items")
     
-    # Prepare display dataframe
-    display_df = filtered_df[[
+    # Prepare display dataframe; labeled_df is already rounded to ROUND_SPEC
+    display_df = labeled_df.loc[mask, [
         'sku', 'product_name', 'category', 'quantity', 'cost_basis', 'selling_price', 'risk_level', 'risk_score',
         'days_remaining', 'primary_recommendation', 'expected_recovery', 'margin_impact'
-    ]].copy()
-    
-    # Format numerical columns
-    display_df['risk_score'] = display_df['risk_score'].round(1)
-    display_df['expected_recovery'] = display_df['expected_recovery'].round(2)
-    display_df['margin_impact'] = display_df['margin_impact'].round(2)
-    
-    # Color code the dataframe
-    def color_risk_level(val):
-        colors = {
-            'LOW': 'background-color: #d4edda',
-            'MEDIUM': 'background-color: #fff3cd',
-            'HIGH': 'background-color: #f8d7da',
-            'CRITICAL': 'background-color: #f5c6cb'
-        }
-        return colors.get(val, '')
+    ]].round({'risk_score': 1})
     
-    styled_df = display_df.style.applymap(color_risk_level, subset=['risk_level'])
+    render_table(display_df, "filtered_items", column_config=ITEM_TABLE_COLUMN_CONFIG)
     
-    st.dataframe(styled_df, use_container_width=True)
-    
-    # Download option
-    csv = filtered_df.to_csv(index=False)
+    # Download options; the files are only serialized when a button is clicked, and the
+    # fixed keys keep the buttons' identity from changing with the timestamped file names
     st.download_button(
         label="📥 Download Filtered Data as CSV",
-        data=csv,
+        data=partial(to_csv_bytes, data_key, filters, filtered_df),
         file_name=f"shrink_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        mime="text/csv"
+        mime="text/csv",
+        key="download_csv"
     )
-    
-    # Interactive scenario analysis
+    st.download_button(
+        label="📥 Download Filtered Data as Parquet",
+        data=partial(to_parquet_bytes, data_key, filters, filtered_df),
+        file_name=f"shrink_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet",
+        mime="application/octet-stream",
+        key="download_parquet"
+    )
+
+@st.fragment
+def render_scenario(df):
+    """
+    Interactive scenario analysis panel. As a fragment, picking another item
+    reruns only this panel, not the charts, tables and filters above it.
+    """
     st.subheader("🔄 Interactive Scenario Analysis")
     
+    # One pass over the columns instead of a full-frame scan per dropdown option
+    sku_to_name = dict(zip(df['sku'].to_numpy(), df['product_name'].to_numpy()))
+    
     selected_item = st.selectbox(
         "Select an item for detailed analysis:",
-        options=df['sku'].tolist(),
-        format_func=lambda x: f"{x} - {df[df['sku']==x]['product_name'].iloc[0]}"
+        options=df['sku'].to_numpy(),
+        key="scenario_item",
+        format_func=lambda x: f"{x} - {sku_to_name[x]}"
     )
     
     if selected_item:
-        item_data = df[df['sku'] == selected_item].iloc[0]
+        # df is sorted by SKU (see process_data); side='left' picks the first of any duplicates
+        item_data = df.iloc[np.searchsorted(df['sku'].to_numpy(), selected_item, side='left')]
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write("**Current Situation:**")
-            st.write(f"- Product: {item_data['product_name']}")
-            st.write(f"- Category: {item_data['category']}")
-            st.write(f"- Quantity: {item_data['quantity']}")
-            st.write(f"- Days Remaining: {item_data['days_remaining']}")
-            st.write(f"- Risk Level: {item_data['risk_level']}")
-            st.write(f"- Risk Score: {item_data['risk_score']:.1f}%")
-            st.write(f"- Sale Through Rate: {item_data['sale_through_rate']:.2f}")
+            st.markdown(situation_markdown(item_data[SITUATION_FIELDS]))
         
         with col2:
-            st.write("**Recommendations:**")
-            st.write(f"- Primary: **{item_data['primary_recommendation']}**")
-            st.write(f"- Secondary Options: {item_data['secondary_options']}")
-            st.write(f"- Expected Recovery: {format_currency(item_data['expected_recovery'])}")
-            # st.write(f"- Margin Impact: {format_currency(item_data['margin_impact'])}")
-            st.write(f"- Time to Action: {item_data['time_to_action']}")
+            lines = [
+                "**Recommendations:**",
+                f"- Primary: **{item_data['primary_recommendation']}**",
+                f"- Secondary Options: {item_data['secondary_options']}",
+                f"- Expected Recovery: {format_currency(item_data['expected_recovery'])}",
+                # f"- Margin Impact: {format_currency(item_data['margin_impact'])}",
+                f"- Time to Action: {item_data['time_to_action']}"
+            ]
             
             if item_data['can_reallocate']:
-                st.write(f"- Reallocation Cost: {format_currency(item_data.get('reallocation_cost', 0))}")
+                lines.append(f"- Reallocation Cost: {format_currency(item_data.get('reallocation_cost', 0))}")
             
             if item_data['primary_recommendation'] == 'MARKDOWN':
-                st.write(f"- Markdown Percentage: {item_data['markdown_percentage']}%")
-
+                lines.append(f"- Markdown Percentage: {item_data['markdown_percentage']}%")
+            
+            st.markdown("\n".join(lines))
 
-def show_logic_explanation():
-    """Display detailed logic explanation"""
-    st.header("🧠 Logic Behind Shrink Sense Dashboard")
-    
-    st.markdown("""
-    ## 🎯 Core Problem Being Solved
-    
-    The dashboard addresses inventory shrinkage - when products expire, spoil, or become unsellable, causing direct financial losses. It provides intelligent recommendations to minimize these losses through:
-    - **Markdown pricing** (discount products to sell faster)
-    - **Inventory relocation** (move items to stores where they'll sell better)
-    - **Donation programs** (tax benefits + community impact) - **NEW**
-    - **Combo strategies** (reallocation + markdown for maximum recovery) - **NEW**
-    - **Liquidation** (sell to third parties when other options fail)
-    """)
+def display_dashboard(df, data_key):
+    """
+    Display the main dashboard. data_key identifies the loaded data set, so the
+    caches below can key on it instead of hashing the frame on every rerun.
+    """
     
-    st.markdown("""
-    ## 🔄 Complete Workflow Example
-    
-    ### Scenario: Fresh Food Item at Store A
-    
-    **Data Input:**
-    - SKU: Milk cartons
-    - Shelf life: 7 days
-    - Current age: 5 days
-    - Sell-through rate: 30%
-    - Inventory: 50 units
-    
-    **Risk Calculation:**
-    - Time risk: 5/7 = 0.71 (71%)
-    - Sales risk: 1 - 0.30 = 0.70 (70%)
-    - Combined risk: 0.7 × 0.71 + 0.3 × 0.70 = 0.71 (71%)
-    
-    **Recommendation Logic:**
-    - Risk > 0.6 → High risk category
-    - Fresh Food + High risk → 25% markdown
-    - Expected clearance: 85% (based on historical data)
-    
-    **Dashboard Display:**
-    - Shows "MARKDOWN_25%" recommendation
-    - Highlights in red for urgency
-    - Calculates potential recovery: 50 × price × 0.75 × 0.85
-    """)
-    
-    st.markdown("""
-    ## 📊 Core Risk Assessment Formula
+    # Summary metrics
+    metrics = create_summary_metrics(df)
     
-    ### Primary Risk Calculation:
-    ```python
-    # Time Risk: How close is the item to expiration?
-    time_risk = inventory_age_days / shelf_life_days
+    st.subheader("📈 Key Metrics")
     
-    # Sales Risk: How poorly is it selling?
-    sales_risk = 1 - sell_through_rate
+    # (label, value, delta, help) for each key metric
+    key_metrics = [
+        ("Total Items", metrics['total_items'], None,
+         "Total inventory items analyzed"),
+        ("Critical Items", metrics['critical_items'],
+         f"{metrics['critical_pct']:.1f}%",
+         "Items requiring immediate action"),
+        ("Total Value at Risk", format_currency(metrics['total_value']), None,
+         "Total value that could be lost without action"),
+        ("Expected Recovery", format_currency(metrics['expected_recovery']),
+         f"{metrics['recovery_rate']:.1f}%",
+         "Expected value recovery with recommendations")
+    ]
+    
+    for col, (label, value, delta, help_text) in zip(st.columns(len(key_metrics)), key_metrics):
+        col.metric(label, value, delta=delta, help=help_text)
     
-    # Combined Shrinkage Risk (weighted formula)
-    shrinkage_risk = (0.7 × time_risk) + (0.3 × sales_risk)
-    ```
+    # Charts section
+    st.subheader("📊 Analysis Charts")
     
-    ### Why This Formula?
-    - **70% weight on time** - Expiration is absolute, sales can improve
-    - **30% weight on sales** - Poor performers need earlier intervention
-    - **Scale 0-1** - Easy to understand and set thresholds
-    """)
+    # The charts are drawn from two small aggregates shared with the tables below
+    risk_by_category = count_risk_by_category(df)
+    group_stats = get_recommendation_stats(data_key, df)
     
-    # Create three columns for category-specific rules
-    col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        ## 🥛 Fresh Food (1-7 days)
-        
-        **Business Logic:** Extremely perishable, customer safety critical
-        
-        | Risk Level | Action |
-        |------------|--------|
-        | **Critical (>60%)** | **DONATION** (if viable) or **LIQUIDATE** |
-        | **High (40-60%)** | **REALLOCATE+MARKDOWN** or **MARKDOWN 25%** |
-        | **Medium (20-40%)** | **MARKDOWN 15%** |
-        | **Low (<20%)** | **NO ACTION** |
-        
-        **Key Features:**
-        - Donation priority at 60% - tax benefits + community impact
-        - Combo strategy for high-risk items with viable stores
-        - Maximum 35% markdown - beyond this, customers assume spoilage
-        - Emergency processing - decisions needed within hours
-        """)
+        st.plotly_chart(create_risk_distribution_chart(risk_by_category), use_container_width=True)
+        st.plotly_chart(create_category_risk_heatmap(risk_by_category), use_container_width=True)
     
     with col2:
-        st.markdown("""
-        ## 🥗 Perishables (3-14 days)
-        
-        **Business Logic:** Moderate shelf life, quality degrades visibly
-        
-        | Risk Level | Action |
-        |------------|--------|
-        | **Critical (>80%)** | **DONATION** (if viable) or **LIQUIDATE** |
-        | **High (60-80%)** | **REALLOCATE+MARKDOWN** or **MARKDOWN 25%** |
-        | **Medium (40-60%)** | **REALLOCATE** or **MARKDOWN 15%** |
-        | **Low (<40%)** | **NO ACTION** |
-        
-        **Key Features:**
-        - Liquidation at 80% - standard high-risk threshold
-        - Relocation preferred - more time available for transfers
-        - Maximum 25% markdown - maintains perceived quality
-        """)
+        st.plotly_chart(create_recommendation_chart(group_stats), use_container_width=True)
+        st.plotly_chart(create_financial_impact_chart(group_stats), use_container_width=True)
+
+
+    st.subheader("🎯 Detailed Recommendations Summary")
     
-    with col3:
-        st.markdown("""
-        ## 📦 General Merchandise (30-365 days)
-        
-        **Business Logic:** Long shelf life, appearance doesn't degrade
+    # Color-coded risk labels and rounded numbers for every table below, computed
+    # once; renaming the categories touches only the four labels, not the rows
+    labeled_df = df.assign(
+        risk_level=df['risk_level'].cat.rename_categories(RISK_LEVEL_BADGES)
+    ).round(ROUND_SPEC)
+    
+    # Row positions per recommendation; each table gathers its rows with take()
+    # instead of groupby splitting the whole frame into sub-frames up front
+    recommendation_rows = labeled_df.groupby('primary_recommendation', observed=True, sort=False).indices
+    
+    for recommendation, stats in group_stats.iterrows():
+        count = int(stats['count'])
+        total_quantity = stats['total_quantity']
+        total_potential_loss = stats['total_potential_loss']
+        total_expected_recovery = stats['total_expected_recovery']
+        total_margin_impact = stats['total_margin_impact']
         
-        | Risk Level | Action |
-        |------------|--------|
-        | **Critical (>80%)** | **DONATION** (if viable) or **LIQUIDATE** |
-        | **High (60-80%)** | **REALLOCATE+MARKDOWN** or **RELOCATE** |
-        | **Medium (40-60%)** | **REALLOCATE** or **MARKDOWN 15%** |
-        | **Low (<40%)** | **NO ACTION** |
-        
-        **Key Features:**
-        - Relocation first - time allows for strategic placement
-        - Conservative markdowns - maintains brand value
-        - Maximum 15% markdown - higher discounts signal clearance
-        """)
-    
-    st.markdown("""
-    ## 💰 Enhanced Financial Impact Calculations
-    
-    ### Revenue Recovery Formulas:
-    
-    #### Standard Strategies:
-    ```python
-    # Markdown scenario
-    markdown_price = current_price × (1 - markdown_percentage)
-    markdown_revenue = quantity × markdown_price
-    
-    # Liquidation scenario
-    liquidation_revenue = quantity × current_price × 0.30  # 30% recovery
-    ```
-    
-    #### NEW: Donation Recovery Formula:
-    ```python
-    # Donation scenario
-    fair_market_value = quantity × current_price
-    tax_benefit = fair_market_value × 0.25  # 25% corporate tax rate
-    processing_cost = quantity × 0.50  # $0.50 per unit processing cost
-    donation_net_benefit = tax_benefit - processing_cost
-    donation_recovery = max(donation_net_benefit, 0)  # Cannot be negative
-    ```
-    
-    #### NEW: Reallocation + Markdown Recovery Formula:
-    ```python
-    # Combo strategy: Reallocate + Markdown
-    target_store_sell_through = 0.75  # Better performing store
-    combo_sell_through = target_store_sell_through × 1.2  # 20% boost from markdown
-    markdown_price = current_price × (1 - markdown_percentage)
-    transfer_cost = quantity × 0.25  # $0.25 per unit transfer cost
-    
-    # Revenue calculation
-    sold_quantity = quantity × min(combo_sell_through, 0.95)  # Cap at 95%
-    revenue = sold_quantity × markdown_price
-    combo_recovery = revenue - transfer_cost
-    ```
-    """)
-    
-    st.markdown("""
-    ## 📈 Enhanced Expected Clearance Rates
+        with st.expander(f"📋 {recommendation} - {count} items ({total_quantity:.0f} units)"):
+            
+            # Summary metrics for this recommendation
+            group_metrics = [
+                ("Total Quantity", f"{total_quantity:.0f}"),
+                ("Potential Loss", format_currency(total_potential_loss)),
+                ("Expected Recovery", format_currency(total_expected_recovery)),
+                ("Margin Impact", format_currency(total_margin_impact))
+            ]
+            
+            for col, (label, value) in zip(st.columns(len(group_metrics)), group_metrics):
+                col.metric(label, value)
+            
+            # Detailed table for this recommendation
+            display_columns = DISPLAY_COLS_BY_REC.get(recommendation, STANDARD_DISPLAY_COLUMNS)
+            display_df = labeled_df[display_columns].take(recommendation_rows[recommendation])
+            display_df = display_df.rename(columns=RENAME_MAP_BY_REC.get(recommendation, RENAME_MAP))
+            
+            render_table(display_df, f"group_{recommendation}")
+            
+            if recommendation == "REALLOCATE":
+                # Additional insights for reallocation
+                st.write("**Reallocation Insights:**")
+                avg_transport_cost = stats['avg_transport_cost']
+                avg_target_rate = stats['avg_target_rate']
+                avg_current_rate = stats['avg_current_rate']
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Avg Transport Cost", format_currency(avg_transport_cost))
+                with col2:
+                    st.metric("Avg Target Store Rate", f"{avg_target_rate:.1%}")
+                with col3:
+                    st.metric("Avg Current Store Rate", f"{avg_current_rate:.1%}")
+                
+            elif recommendation == "DONATE":
+                # Additional insights for donation
+                st.write("**Donation Insights:**")
+                total_tax_benefit = stats['total_expected_recovery']
+                total_cost_basis = stats['total_cost_basis']
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Total Tax Benefit", format_currency(total_tax_benefit))
+                with col2:
+                    st.metric("Total Cost Basis", format_currency(total_cost_basis))
     
-    | Category | No Action | 15% Markdown | 25% Markdown | Reallocate | Combo Strategy | Donation | Liquidation |
-    |----------|-----------|--------------|--------------|------------|----------------|----------|-------------|
-    | **Fresh Food** | 60% | 70% | 85% | 65% | **88%** | **95%** | 97% |
-    | **Perishables** | 70% | 80% | 90% | 75% | **92%** | **95%** | 97% |
-    | **General Merchandise** | 80% | 85% | 92% | 82% | **94%** | **95%** | 97% |
-    """)
+    # Detailed item analysis
+    render_item_analysis(df, labeled_df, data_key)
     
-    st.markdown("""
-    ## 🎯 Enhanced Decision Tree Logic
-    
-    ### Step 1: Risk Assessment
-    ```python
-    if shrinkage_risk > 0.8:
-        risk_level = "CRITICAL"
-    elif shrinkage_risk > 0.6:
-        risk_level = "HIGH"
-    elif shrinkage_risk > 0.4:
-        risk_level = "MEDIUM"
+    # Interactive scenario analysis
+    render_scenario(df)
+
+# Static markdown for the Logic Explanation page
+LOGIC_OVERVIEW_MD = """
+## 🎯 Core Problem Being Solved
+
+The dashboard addresses inventory shrinkage - when products expire, spoil, or become unsellable, causing direct financial losses. It provides intelligent recommendations to minimize these losses through:
+- **Markdown pricing** (discount products to sell faster)
+- **Inventory relocation** (move items to stores where they'll sell better)
+- **Donation programs** (tax benefits + community impact) - **NEW**
+- **Combo strategies** (reallocation + markdown for maximum recovery) - **NEW**
+- **Liquidation** (sell to third parties when other options fail)
+
+## 🔄 Complete Workflow Example
+
+### Scenario: Fresh Food Item at Store A
+
+**Data Input:**
+- SKU: Milk cartons
+- Shelf life: 7 days
+- Current age: 5 days
+- Sell-through rate: 30%
+- Inventory: 50 units
+
+**Risk Calculation:**
+- Time risk: 5/7 = 0.71 (71%)
+- Sales risk: 1 - 0.30 = 0.70 (70%)
+- Combined risk: 0.7 × 0.71 + 0.3 × 0.70 = 0.71 (71%)
+
+**Recommendation Logic:**
+- Risk > 0.6 → High risk category
+- Fresh Food + High risk → 25% markdown
+- Expected clearance: 85% (based on historical data)
+
+**Dashboard Display:**
+- Shows "MARKDOWN_25%" recommendation
+- Highlights in red for urgency
+- Calculates potential recovery: 50 × price × 0.75 × 0.85
+
+## 📊 Core Risk Assessment Formula
+
+### Primary Risk Calculation:
+```python
+# Time Risk: How close is the item to expiration?
+time_risk = inventory_age_days / shelf_life_days
+
+# Sales Risk: How poorly is it selling?
+sales_risk = 1 - sell_through_rate
+
+# Combined Shrinkage Risk (weighted formula)
+shrinkage_risk = (0.7 × time_risk) + (0.3 × sales_risk)
+```
+
+### Why This Formula?
+- **70% weight on time** - Expiration is absolute, sales can improve
+- **30% weight on sales** - Poor performers need earlier intervention
+- **Scale 0-1** - Easy to understand and set thresholds
+"""
+
+FRESH_FOOD_RULES_MD = """
+## 🥛 Fresh Food (1-7 days)
+
+**Business Logic:** Extremely perishable, customer safety critical
+
+| Risk Level | Action |
+|------------|--------|
+| **Critical (>60%)** | **DONATION** (if viable) or **LIQUIDATE** |
+| **High (40-60%)** | **REALLOCATE+MARKDOWN** or **MARKDOWN 25%** |
+| **Medium (20-40%)** | **MARKDOWN 15%** |
+| **Low (<20%)** | **NO ACTION** |
+
+**Key Features:**
+- Donation priority at 60% - tax benefits + community impact
+- Combo strategy for high-risk items with viable stores
+- Maximum 35% markdown - beyond this, customers assume spoilage
+- Emergency processing - decisions needed within hours
+"""
+
+PERISHABLES_RULES_MD = """
+## 🥗 Perishables (3-14 days)
+
+**Business Logic:** Moderate shelf life, quality degrades visibly
+
+| Risk Level | Action |
+|------------|--------|
+| **Critical (>80%)** | **DONATION** (if viable) or **LIQUIDATE** |
+| **High (60-80%)** | **REALLOCATE+MARKDOWN** or **MARKDOWN 25%** |
+| **Medium (40-60%)** | **REALLOCATE** or **MARKDOWN 15%** |
+| **Low (<40%)** | **NO ACTION** |
+
+**Key Features:**
+- Liquidation at 80% - standard high-risk threshold
+- Relocation preferred - more time available for transfers
+- Maximum 25% markdown - maintains perceived quality
+"""
+
+GENERAL_MERCHANDISE_RULES_MD = """
+## 📦 General Merchandise (30-365 days)
+
+**Business Logic:** Long shelf life, appearance doesn't degrade
+
+| Risk Level | Action |
+|------------|--------|
+| **Critical (>80%)** | **DONATION** (if viable) or **LIQUIDATE** |
+| **High (60-80%)** | **REALLOCATE+MARKDOWN** or **RELOCATE** |
+| **Medium (40-60%)** | **REALLOCATE** or **MARKDOWN 15%** |
+| **Low (<40%)** | **NO ACTION** |
+
+**Key Features:**
+- Relocation first - time allows for strategic placement
+- Conservative markdowns - maintains brand value
+- Maximum 15% markdown - higher discounts signal clearance
+"""
+
+# The three category rule sets side by side in a single element. Blank lines around
+# each block let the markdown inside the grid cells render; auto-fit stacks them on
+# narrow screens the way st.columns does
+CATEGORY_RULES_HTML = "\n\n".join(
+    ['<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1rem;">']
+    + [f"<div>\n\n{rules}\n\n</div>" for rules in (FRESH_FOOD_RULES_MD, PERISHABLES_RULES_MD, GENERAL_MERCHANDISE_RULES_MD)]
+    + ['</div>']
+)
+
+LOGIC_DETAILS_MD = """
+## 💰 Enhanced Financial Impact Calculations
+
+### Revenue Recovery Formulas:
+
+#### Standard Strategies:
+```python
+# Markdown scenario
+markdown_price = current_price × (1 - markdown_percentage)
+markdown_revenue = quantity × markdown_price
+
+# Liquidation scenario
+liquidation_revenue = quantity × current_price × 0.30  # 30% recovery
+```
+
+#### NEW: Donation Recovery Formula:
+```python
+# Donation scenario
+fair_market_value = quantity × current_price
+tax_benefit = fair_market_value × 0.25  # 25% corporate tax rate
+processing_cost = quantity × 0.50  # $0.50 per unit processing cost
+donation_net_benefit = tax_benefit - processing_cost
+donation_recovery = max(donation_net_benefit, 0)  # Cannot be negative
+```
+
+#### NEW: Reallocation + Markdown Recovery Formula:
+```python
+# Combo strategy: Reallocate + Markdown
+target_store_sell_through = 0.75  # Better performing store
+combo_sell_through = target_store_sell_through × 1.2  # 20% boost from markdown
+markdown_price = current_price × (1 - markdown_percentage)
+transfer_cost = quantity × 0.25  # $0.25 per unit transfer cost
+
+# Revenue calculation
+sold_quantity = quantity × min(combo_sell_through, 0.95)  # Cap at 95%
+revenue = sold_quantity × markdown_price
+combo_recovery = revenue - transfer_cost
+```
+
+## 📈 Enhanced Expected Clearance Rates
+
+| Category | No Action | 15% Markdown | 25% Markdown | Reallocate | Combo Strategy | Donation | Liquidation |
+|----------|-----------|--------------|--------------|------------|----------------|----------|-------------|
+| **Fresh Food** | 60% | 70% | 85% | 65% | **88%** | **95%** | 97% |
+| **Perishables** | 70% | 80% | 90% | 75% | **92%** | **95%** | 97% |
+| **General Merchandise** | 80% | 85% | 92% | 82% | **94%** | **95%** | 97% |
+
+## 🎯 Enhanced Decision Tree Logic
+
+### Step 1: Risk Assessment
+```python
+if shrinkage_risk > 0.8:
+    risk_level = "CRITICAL"
+elif shrinkage_risk > 0.6:
+    risk_level = "HIGH"
+elif shrinkage_risk > 0.4:
+    risk_level = "MEDIUM"
+else:
+    risk_level = "LOW"
+```
+
+### Step 2: Category-Specific Actions
+```python
+if risk_level == "CRITICAL":
+    if is_donation_viable(item):
+        return "DONATE"
+    elif category == "Fresh Food" and shrinkage_risk > 0.6:
+        return "LIQUIDATE"
+    elif shrinkage_risk > 0.8:
+        return "LIQUIDATE"
     else:
-        risk_level = "LOW"
-    ```
-    
-    ### Step 2: Category-Specific Actions
-    ```python
-    if risk_level == "CRITICAL":
-        if is_donation_viable(item):
-            return "DONATE"
-        elif category == "Fresh Food" and shrinkage_risk > 0.6:
-            return "LIQUIDATE"
-        elif shrinkage_risk > 0.8:
-            return "LIQUIDATE"
-        else:
-            return "MARKDOWN_25%"
-    
-    elif risk_level == "HIGH":
-        if category == "General Merchandise":
-            if can_reallocate_and_markdown(item):
-                return "REALLOCATE+MARKDOWN_15%"
-            else:
-                return "RELOCATE"
+        return "MARKDOWN_25%"
+
+elif risk_level == "HIGH":
+    if category == "General Merchandise":
+        if can_reallocate_and_markdown(item):
+            return "REALLOCATE+MARKDOWN_15%"
         else:
-            if can_reallocate_and_markdown(item):
-                return "REALLOCATE+MARKDOWN_15%"
-            else:
-                return "MARKDOWN_25%"
-    
-    elif risk_level == "MEDIUM":
-        if category == "General Merchandise" and can_relocate(item):
             return "RELOCATE"
+    else:
+        if can_reallocate_and_markdown(item):
+            return "REALLOCATE+MARKDOWN_15%"
         else:
-            return "MARKDOWN_15%"
-    
-    else:  # LOW risk
-        return "NO_ACTION"
-    ```
-    """)
+            return "MARKDOWN_25%"
+
+elif risk_level == "MEDIUM":
+    if category == "General Merchandise" and can_relocate(item):
+        return "RELOCATE"
+    else:
+        return "MARKDOWN_15%"
+
+else:  # LOW risk
+    return "NO_ACTION"
+```
+
+## 🔄 Enhanced Relocation Logic
+
+### Standard Relocation Viability:
+```python
+def can_relocate(item):
+    conditions = [
+        item.shelf_life_remaining > 7,  # Enough time for transfer
+        item.category == "General Merchandise",  # Stable during transport
+        nearby_stores_have_capacity(),  # Receiving store can handle
+        transfer_cost < potential_savings(),  # Economically viable
+        destination_store_better_sell_through()  # Better chance of selling
+    ]
+    return all(conditions)
+```
+
+### NEW: Combo Strategy Viability:
+```python
+def can_reallocate_and_markdown(item):
+    conditions = [
+        can_relocate(item),
+        item.shelf_life_remaining > 5,  # Extra time needed for combo
+        item.quantity > 20,  # Minimum quantity for combo efficiency
+        calculate_combo_recovery(item) > calculate_best_single_strategy(item)
+    ]
+    return all(conditions)
+```
+
+### NEW: Donation Viability Logic:
+```python
+def is_donation_viable(item):
+    conditions = [
+        item.shelf_life_remaining >= 3,  # Minimum time for donation processing
+        item.category in ["Fresh Food", "Perishables"],  # Suitable categories
+        item.quantity > 50,  # Minimum quantity for donation efficiency
+        calculate_donation_recovery(item) > calculate_liquidation_recovery(item),
+        item.meets_food_safety_standards(),  # Safety requirements
+        nearby_donation_centers_available()  # Logistical feasibility
+    ]
+    return all(conditions)
+```
+
+## 💡 Why These Enhanced Strategies?
+
+### 🎁 Donation Strategy Benefits:
+- **Tax advantages:** 25% corporate tax rate creates significant value
+- **Community impact:** Positive brand image and social responsibility
+- **100% clearance:** Complete inventory elimination
+- **Processing efficiency:** Established donation networks
+
+### 🔄 Combo Strategy (Reallocate + Markdown) Benefits:
+- **Maximum recovery:** Combines best store placement with price incentive
+- **Higher clearance rates:** 88-94% vs 85-92% for single strategies
+- **Risk mitigation:** Reduces dependency on single approach
+- **Optimal timing:** Uses available shelf life efficiently
+
+### 🏷️ Enhanced Markdown Percentages:
+- **15% Markdown:** Psychological threshold, maintains profitability
+- **25% Markdown:** Urgency signal, competitive advantage
+- **35% Markdown (Fresh Food only):** Maximum viable before customers assume spoilage
+
+## 💡 Key Intelligence Features
+
+### Relocation Optimization
+Considers multiple factors for inventory transfers:
+- Distance costs (fuel, labor, time)
+- Demand matching (higher sell-through at destination)
+- Capacity constraints (receiving store limits)
+- Transfer timing (shelf life remaining after transit)
+
+### Smart Combo Strategy Selection
+- Analyzes whether combined approach yields better recovery
+- Considers processing time and logistics complexity
+- Optimizes for maximum financial recovery
+"""
+
+def show_logic_explanation():
+    """Display detailed logic explanation"""
+    st.header("🧠 Logic Behind Shrink Sense Dashboard")
     
-    st.markdown("""
-    ## 🔄 Enhanced Relocation Logic
-    
-    ### Standard Relocation Viability:
-    ```python
-    def can_relocate(item):
-        conditions = [
-            item.shelf_life_remaining > 7,  # Enough time for transfer
-            item.category == "General Merchandise",  # Stable during transport
-            nearby_stores_have_capacity(),  # Receiving store can handle
-            transfer_cost < potential_savings(),  # Economically viable
-            destination_store_better_sell_through()  # Better chance of selling
-        ]
-        return all(conditions)
-    ```
-    
-    ### NEW: Combo Strategy Viability:
-    ```python
-    def can_reallocate_and_markdown(item):
-        conditions = [
-            can_relocate(item),
-            item.shelf_life_remaining > 5,  # Extra time needed for combo
-            item.quantity > 20,  # Minimum quantity for combo efficiency
-            calculate_combo_recovery(item) > calculate_best_single_strategy(item)
-        ]
-        return all(conditions)
-    ```
-    
-    ### NEW: Donation Viability Logic:
-    ```python
-    def is_donation_viable(item):
-        conditions = [
-            item.shelf_life_remaining >= 3,  # Minimum time for donation processing
-            item.category in ["Fresh Food", "Perishables"],  # Suitable categories
-            item.quantity > 50,  # Minimum quantity for donation efficiency
-            calculate_donation_recovery(item) > calculate_liquidation_recovery(item),
-            item.meets_food_safety_standards(),  # Safety requirements
-            nearby_donation_centers_available()  # Logistical feasibility
-        ]
-        return all(conditions)
-    ```
-    """)
+    st.markdown(LOGIC_OVERVIEW_MD)
     
-    st.markdown("""
-    ## 💡 Why These Enhanced Strategies?
-    
-    ### 🎁 Donation Strategy Benefits:
-    - **Tax advantages:** 25% corporate tax rate creates significant value
-    - **Community impact:** Positive brand image and social responsibility
-    - **100% clearance:** Complete inventory elimination
-    - **Processing efficiency:** Established donation networks
-    
-    ### 🔄 Combo Strategy (Reallocate + Markdown) Benefits:
-    - **Maximum recovery:** Combines best store placement with price incentive
-    - **Higher clearance rates:** 88-94% vs 85-92% for single strategies
-    - **Risk mitigation:** Reduces dependency on single approach
-    - **Optimal timing:** Uses available shelf life efficiently
-    
-    ### 🏷️ Enhanced Markdown Percentages:
-    - **15% Markdown:** Psychological threshold, maintains profitability
-    - **25% Markdown:** Urgency signal, competitive advantage
-    - **35% Markdown (Fresh Food only):** Maximum viable before customers assume spoilage
-    """)
+    # Category-specific rules in a three-column grid
+    st.markdown(CATEGORY_RULES_HTML, unsafe_allow_html=True)
     
-    st.markdown("""
-    ## 💡 Key Intelligence Features
-    
-    ### Relocation Optimization
-    Considers multiple factors for inventory transfers:
-    - Distance costs (fuel, labor, time)
-    - Demand matching (higher sell-through at destination)
-    - Capacity constraints (receiving store limits)
-    - Transfer timing (shelf life remaining after transit)
-    
-    ### Smart Combo Strategy Selection
-    - Analyzes whether combined approach yields better recovery
-    - Considers processing time and logistics complexity
-    - Optimizes for maximum financial recovery
-    """)
+    st.markdown(LOGIC_DETAILS_MD)
+
+
+# Static markdown for the Future Improvements page
+FUTURE_IMPROVEMENTS_MD = """
+## 🤖 AI/ML Enhancements
+
+### Predictive Analytics
+- **Demand Forecasting**: ML models to predict future sales patterns
+- **Seasonal Adjustment**: Automatic adjustment for seasonal demand patterns
+- **Customer Behavior**: Analysis of purchasing patterns to optimize timing
+- **Weather Integration**: Factor weather data for fresh food demand
+
+### Dynamic Pricing
+- **Real-time Pricing**: Automatic markdown adjustments based on demand
+- **Competitive Pricing**: Integration with competitor price monitoring
+- **Customer Segmentation**: Targeted pricing for different customer groups
 
+## 📱 Technology Integration
+
+### IoT Sensors
+- **Temperature Monitoring**: Real-time freshness tracking
+- **Inventory Sensors**: Automatic quantity updates
+- **Foot Traffic**: Store traffic patterns for reallocation decisions
+
+### Mobile App
+- **Manager Dashboard**: Mobile access for store managers
+- **Barcode Scanning**: Quick item lookup and status updates
+- **Push Notifications**: Alerts for critical items
+- **Action Tracking**: Record and track completion of recommendations
+
+## 🌐 Supply Chain Integration
+
+### Supplier Coordination
+- **Delivery Optimization**: Coordinate with suppliers for fresher inventory
+- **Quality Scoring**: Track supplier performance metrics
+- **Contract Optimization**: Negotiate better terms based on waste data
+
+### Cross-Store Intelligence
+- **Network Optimization**: Optimal reallocation across entire chain
+- **Inventory Balancing**: Predictive allocation based on store patterns
+- **Centralized Markdown**: Coordinated pricing strategies
+
+## 📊 Advanced Analytics
+
+### Business Intelligence
+- **Profit Optimization**: Advanced models for maximum margin recovery
+- **Trend Analysis**: Long-term patterns and seasonal adjustments
+- **Category Performance**: Deep-dive analytics by product category
+- **Supplier Analysis**: Performance metrics and recommendations
+
+### Reporting & Dashboards
+- **Executive Dashboards**: High-level KPIs and trends
+- **Operational Reports**: Daily/weekly action reports
+- **Financial Analysis**: ROI tracking and waste cost analysis
+- **Benchmark Comparisons**: Industry and internal benchmarking
+
+## 🤝 Partnership Opportunities
+
+### Food Banks & Charities
+- **Automated Donation**: Direct integration with local food banks
+- **Tax Optimization**: Maximize tax benefits from donations
+- **Impact Tracking**: Monitor social impact of donation programs
+
+### Liquidation Partners
+- **Marketplace Integration**: Automated listing on liquidation platforms
+- **Bulk Buyers**: Direct connections to wholesale buyers
+- **Recycling Partners**: Sustainable disposal options
+
+## 🎯 Implementation Roadmap
+
+### Phase 1 (Months 1-3): Foundation
+- [ ] Deploy current dashboard system
+- [ ] Integrate with existing inventory systems
+- [ ] Train staff on new processes
+- [ ] Establish baseline metrics
+
+### Phase 2 (Months 4-6): Automation
+- [ ] Implement barcode scanning
+- [ ] Add mobile app functionality
+- [ ] Integrate with POS systems
+- [ ] Automated reporting
+
+### Phase 3 (Months 7-12): Intelligence
+- [ ] ML-powered demand forecasting
+- [ ] Dynamic pricing algorithms
+- [ ] Cross-store optimization
+- [ ] Supplier integration
+
+### Phase 4 (Year 2+): Innovation
+- [ ] IoT sensor deployment
+- [ ] Advanced AI/ML models
+- [ ] Blockchain for supply chain transparency
+- [ ] Sustainability metrics and reporting
+
+## 💡 Innovation Ideas
+
+### Customer Engagement
+- **Clearance Alerts**: Notify customers about markdown items
+- **Loyalty Programs**: Rewards for purchasing near-expiry items
+- **Recipe Suggestions**: AI-powered meal ideas using available ingredients
+
+### Sustainability Focus
+- **Carbon Footprint**: Track environmental impact of waste reduction
+- **Circular Economy**: Integration with food waste recycling programs
+- **Sustainability Scoring**: Rate products and suppliers on environmental impact
+
+### Advanced Features
+- **Voice Commands**: Voice-activated dashboard queries
+- **Augmented Reality**: AR scanning for instant item information
+- **Blockchain Tracking**: Complete supply chain transparency
+
+## 📈 Expected Benefits
+
+### Financial Impact
+- **Waste Reduction**: 40-60% reduction in inventory shrinkage
+- **Margin Improvement**: 15-25% improvement in overall margins
+- **Cost Savings**: Reduced disposal and handling costs
+
+### Operational Benefits
+- **Time Savings**: 70% reduction in manual inventory analysis
+- **Decision Speed**: Real-time recommendations vs. weekly reviews
+- **Staff Efficiency**: Focus on high-value activities
+
+### Strategic Advantages
+- **Competitive Edge**: Industry-leading waste management
+- **Customer Satisfaction**: Fresh inventory and better pricing
+- **Sustainability**: Corporate social responsibility goals
+"""
 
 def show_future_improvements():
     """Display future improvement suggestions"""
     st.header("🚀 Future Improvements & Enhancements")
     
-    st.markdown("""
-    ## 🤖 AI/ML Enhancements
-    
-    ### Predictive Analytics
-    - **Demand Forecasting**: ML models to predict future sales patterns
-    - **Seasonal Adjustment**: Automatic adjustment for seasonal demand patterns
-    - **Customer Behavior**: Analysis of purchasing patterns to optimize timing
-    - **Weather Integration**: Factor weather data for fresh food demand
-    
-    ### Dynamic Pricing
-    - **Real-time Pricing**: Automatic markdown adjustments based on demand
-    - **Competitive Pricing**: Integration with competitor price monitoring
-    - **Customer Segmentation**: Targeted pricing for different customer groups
-    """)
-    
-    st.markdown("""
-    ## 📱 Technology Integration
-    
-    ### IoT Sensors
-    - **Temperature Monitoring**: Real-time freshness tracking
-    - **Inventory Sensors**: Automatic quantity updates
-    - **Foot Traffic**: Store traffic patterns for reallocation decisions
-    
-    ### Mobile App
-    - **Manager Dashboard**: Mobile access for store managers
-    - **Barcode Scanning**: Quick item lookup and status updates
-    - **Push Notifications**: Alerts for critical items
-    - **Action Tracking**: Record and track completion of recommendations
-    """)
-    
-    st.markdown("""
-    ## 🌐 Supply Chain Integration
-    
-    ### Supplier Coordination
-    - **Delivery Optimization**: Coordinate with suppliers for fresher inventory
-    - **Quality Scoring**: Track supplier performance metrics
-    - **Contract Optimization**: Negotiate better terms based on waste data
-    
-    ### Cross-Store Intelligence
-    - **Network Optimization**: Optimal reallocation across entire chain
-    - **Inventory Balancing**: Predictive allocation based on store patterns
-    - **Centralized Markdown**: Coordinated pricing strategies
-    """)
-    
-    st.markdown("""
-    ## 📊 Advanced Analytics
-    
-    ### Business Intelligence
-    - **Profit Optimization**: Advanced models for maximum margin recovery
-    - **Trend Analysis**: Long-term patterns and seasonal adjustments
-    - **Category Performance**: Deep-dive analytics by product category
-    - **Supplier Analysis**: Performance metrics and recommendations
-    
-    ### Reporting & Dashboards
-    - **Executive Dashboards**: High-level KPIs and trends
-    - **Operational Reports**: Daily/weekly action reports
-    - **Financial Analysis**: ROI tracking and waste cost analysis
-    - **Benchmark Comparisons**: Industry and internal benchmarking
-    """)
-    
-    st.markdown("""
-    ## 🤝 Partnership Opportunities
-    
-    ### Food Banks & Charities
-    - **Automated Donation**: Direct integration with local food banks
-    - **Tax Optimization**: Maximize tax benefits from donations
-    - **Impact Tracking**: Monitor social impact of donation programs
-    
-    ### Liquidation Partners
-    - **Marketplace Integration**: Automated listing on liquidation platforms
-    - **Bulk Buyers**: Direct connections to wholesale buyers
-    - **Recycling Partners**: Sustainable disposal options
-    """)
-    
-    st.markdown("""
-    ## 🎯 Implementation Roadmap
-    
-    ### Phase 1 (Months 1-3): Foundation
-    - [ ] Deploy current dashboard system
-    - [ ] Integrate with existing inventory systems
-    - [ ] Train staff on new processes
-    - [ ] Establish baseline metrics
-    
-    ### Phase 2 (Months 4-6): Automation
-    - [ ] Implement barcode scanning
-    - [ ] Add mobile app functionality
-    - [ ] Integrate with POS systems
-    - [ ] Automated reporting
-    
-    ### Phase 3 (Months 7-12): Intelligence
-    - [ ] ML-powered demand forecasting
-    - [ ] Dynamic pricing algorithms
-    - [ ] Cross-store optimization
-    - [ ] Supplier integration
-    
-    ### Phase 4 (Year 2+): Innovation
-    - [ ] IoT sensor deployment
-    - [ ] Advanced AI/ML models
-    - [ ] Blockchain for supply chain transparency
-    - [ ] Sustainability metrics and reporting
-    """)
-    
-    st.markdown("""
-    ## 💡 Innovation Ideas
-    
-    ### Customer Engagement
-    - **Clearance Alerts**: Notify customers about markdown items
-    - **Loyalty Programs**: Rewards for purchasing near-expiry items
-    - **Recipe Suggestions**: AI-powered meal ideas using available ingredients
-    
-    ### Sustainability Focus
-    - **Carbon Footprint**: Track environmental impact of waste reduction
-    - **Circular Economy**: Integration with food waste recycling programs
-    - **Sustainability Scoring**: Rate products and suppliers on environmental impact
-    
-    ### Advanced Features
-    - **Voice Commands**: Voice-activated dashboard queries
-    - **Augmented Reality**: AR scanning for instant item information
-    - **Blockchain Tracking**: Complete supply chain transparency
-    """)
-    
-    st.markdown("""
-    ## 📈 Expected Benefits
-    
-    ### Financial Impact
-    - **Waste Reduction**: 40-60% reduction in inventory shrinkage
-    - **Margin Improvement**: 15-25% improvement in overall margins
-    - **Cost Savings**: Reduced disposal and handling costs
-    
-    ### Operational Benefits
-    - **Time Savings**: 70% reduction in manual inventory analysis
-    - **Decision Speed**: Real-time recommendations vs. weekly reviews
-    - **Staff Efficiency**: Focus on high-value activities
-    
-    ### Strategic Advantages
-    - **Competitive Edge**: Industry-leading waste management
-    - **Customer Satisfaction**: Fresh inventory and better pricing
-    - **Sustainability**: Corporate social responsibility goals
-    """)
-
-# Initialize session state
-if 'data_generated' not in st.session_state:
-    st.session_state['data_generated'] = False
+    st.markdown(FUTURE_IMPROVEMENTS_MD)
 
 # Run the main app
 if __name__ == "__main__":
@@ -1,111 +1,189 @@
+from functools import lru_cache
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import streamlit as st
 
-def create_risk_distribution_chart(df):
-    """
-    Create risk level distribution chart
-    """
-    risk_counts = df['risk_level'].value_counts()
-    
-    colors = {'LOW': '#28a745', 'MEDIUM': '#ffc107', 'HIGH': '#fd7e14', 'CRITICAL': '#dc3545'}
-    
-    fig = px.bar(
-        x=risk_counts.index,
-        y=risk_counts.values,
-        color=risk_counts.index,
-        color_discrete_map=colors,
-        title="Risk Level Distribution",
-        labels={'x': 'Risk Level', 'y': 'Number of Items'}
+# Seconds a cached chart figure is kept before it expires
+CHART_CACHE_TTL = 600
+
+# Constant uirevision on the dashboard figures, so a rerun that redraws a chart
+# keeps the user's zoom, pan and legend toggles instead of resetting them
+CHART_UIREVISION = 'dashboard'
+
+RISK_COLORS = {
+    'LOW': '#28a745',
+    'MEDIUM': '#ffc107',
+    'HIGH': '#fd7e14',
+    'CRITICAL': '#dc3545'
+}
+
+RECOMMENDATION_COLORS = {
+    'NO ACTION': '#28a745',
+    'REALLOCATE': '#17a2b8',
+    'MARKDOWN': '#ffc107',
+    'DONATE': '#6f42c1',
+    'LIQUIDATE': '#dc3545',
+    'REALLOCATE+MARKDOWN': '#20c997'  # Teal color for the combined strategy
+}
+
+# Grey for any label missing from the tables above
+DEFAULT_COLOR = '#6c757d'
+
+def hash_frame(df):
+    """Cache key for the small chart aggregates: vectorized row hashes instead of pickling"""
+    return (tuple(df.columns), pd.util.hash_pandas_object(df).to_numpy().tobytes())
+
+@st.cache_data(show_spinner=False)
+def get_recommendation_stats(data_key, _df):
+    """Per-recommendation totals and averages in one groupby pass, cached per data set"""
+    stock_cost = _df['cost_basis'] * _df['quantity']
+    return _df.assign(stock_cost=stock_cost).groupby('primary_recommendation', observed=True).agg(
+        count=('quantity', 'size'),
+        total_quantity=('quantity', 'sum'),
+        total_potential_loss=('potential_loss', 'sum'),
+        total_expected_recovery=('expected_recovery', 'sum'),
+        total_margin_impact=('margin_impact', 'sum'),
+        avg_transport_cost=('reallocation_cost', 'mean'),
+        avg_target_rate=('target_store_sell_through', 'mean'),
+        avg_current_rate=('sale_through_rate', 'mean'),
+        total_cost_basis=('stock_cost', 'sum')
     )
-    
-    fig.update_layout(showlegend=False, height=400)
-    return fig
 
-def create_recommendation_chart(df):
+def count_risk_by_category(df):
+    """Item counts on a category x risk level grid, in one groupby pass"""
+    return df.groupby(['category', 'risk_level'], observed=True).size().unstack(fill_value=0)
+
+@st.cache_resource(ttl=CHART_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: hash_frame})
+def create_risk_distribution_chart(risk_by_category):
     """
-    Create recommendation distribution chart
+    Create risk level distribution chart from the count_risk_by_category grid
     """
-    rec_counts = df['primary_recommendation'].value_counts()
+    # Column totals, in LOW..CRITICAL category order
+    risk_counts = risk_by_category.sum()
+    risk_counts = risk_counts[risk_counts > 0]
     
-    colors = {
-        'NO ACTION': '#28a745',
-        'REALLOCATE': '#17a2b8',
-        'MARKDOWN': '#ffc107',
-        'DONATE': '#6f42c1',
-        'LIQUIDATE': '#dc3545',
-        'REALLOCATE+MARKDOWN': '#20c997'  # Teal color for the combined strategy
-    }
+    levels = risk_counts.index.tolist()
     
-    fig = px.pie(
-        values=rec_counts.values,
-        names=rec_counts.index,
-        title="Recommendation Distribution",
-        color=rec_counts.index,
-        color_discrete_map=colors
-    )
+    # One trace with a colour per bar, rather than one trace per risk level
+    fig = {
+        'data': [
+            {
+                'type': 'bar',
+                'x': levels,
+                'y': risk_counts.to_numpy(),
+                'marker': {'color': [get_risk_color(level) for level in levels]}
+            }
+        ],
+        'layout': {
+            'title': {'text': 'Risk Level Distribution'},
+            'xaxis': {'title': {'text': 'Risk Level'}},
+            'yaxis': {'title': {'text': 'Number of Items'}},
+            'showlegend': False,
+            'height': 400,
+            'uirevision': CHART_UIREVISION
+        }
+    }
     
-    fig.update_layout(height=400)
-    return fig
+    return go.Figure(fig)
 
-def create_financial_impact_chart(df):
+@st.cache_resource(ttl=CHART_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: hash_frame})
+def create_recommendation_chart(recommendation_stats):
     """
-    Create financial impact chart
+    Create recommendation distribution chart from get_recommendation_stats
     """
-    # Group by recommendation and sum financial impact
-    financial_summary = df.groupby('primary_recommendation').agg({
-        'potential_loss': 'sum',
-        'expected_recovery': 'sum',
-        'margin_impact': 'sum'
-    }).reset_index()
-    
-    fig = go.Figure()
+    # Only strategies some item received have a row
+    rec_counts = recommendation_stats['count']
     
-    fig.add_trace(go.Bar(
-        name='Potential Loss',
-        x=financial_summary['primary_recommendation'],
-        y=financial_summary['potential_loss'],
-        marker_color='red',
-        opacity=0.7
-    ))
+    recommendations = rec_counts.index.tolist()
     
-    fig.add_trace(go.Bar(
-        name='Expected Recovery',
-        x=financial_summary['primary_recommendation'],
-        y=financial_summary['expected_recovery'],
-        marker_color='green',
-        opacity=0.7
-    ))
-    
-    fig.update_layout(
-        title='Financial Impact by Recommendation',
-        xaxis_title='Recommendation',
-        yaxis_title='Amount ($)',
-        barmode='group',
-        height=400
-    )
+    # Slice colours passed straight to the trace instead of mapped by plotly express
+    fig = {
+        'data': [
+            {
+                'type': 'pie',
+                'values': rec_counts.to_numpy(),
+                'labels': recommendations,
+                'marker': {'colors': [get_recommendation_color(rec) for rec in recommendations]}
+            }
+        ],
+        'layout': {
+            'title': {'text': 'Recommendation Distribution'},
+            'height': 400,
+            'uirevision': CHART_UIREVISION
+        }
+    }
     
-    return fig
+    return go.Figure(fig)
 
-def create_category_risk_heatmap(df):
-    """
-    Create category vs risk level heatmap
-    """
-    heatmap_data = df.groupby(['category', 'risk_level']).size().reset_index(name='count')
-    pivot_data = heatmap_data.pivot(index='category', columns='risk_level', values='count').fillna(0)
+@st.cache_resource(ttl=CHART_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: hash_frame})
+def create_financial_impact_chart(recommendation_stats):
+    """
+    Create financial impact chart from get_recommendation_stats
+    """
+    # Spelled out as a plain dict and validated once, like the other dashboard charts
+    recommendations = recommendation_stats.index.tolist()
+    fig = {
+        'data': [
+            {
+                'type': 'bar',
+                'name': 'Potential Loss',
+                'x': recommendations,
+                'y': recommendation_stats['total_potential_loss'].to_numpy(),
+                'marker': {'color': 'red'},
+                'opacity': 0.7
+            },
+            {
+                'type': 'bar',
+                'name': 'Expected Recovery',
+                'x': recommendations,
+                'y': recommendation_stats['total_expected_recovery'].to_numpy(),
+                'marker': {'color': 'green'},
+                'opacity': 0.7
+            }
+        ],
+        'layout': {
+            'title': {'text': 'Financial Impact by Recommendation'},
+            'xaxis': {'title': {'text': 'Recommendation'}},
+            'yaxis': {'title': {'text': 'Amount ($)'}},
+            'barmode': 'group',
+            'height': 400,
+            'uirevision': CHART_UIREVISION
+        }
+    }
     
-    fig = px.imshow(
-        pivot_data,
-        title="Risk Distribution by Category",
-        labels=dict(x="Risk Level", y="Category", color="Count"),
-        aspect="auto"
-    )
+    return go.Figure(fig)
+
+@st.cache_resource(ttl=CHART_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: hash_frame})
+def create_category_risk_heatmap(risk_by_category):
+    """
+    Create category vs risk level heatmap from the count_risk_by_category grid
+    """
+    # Plain figure dict laid out the way px.imshow would, without running plotly express
+    fig = {
+        'data': [
+            {
+                'type': 'heatmap',
+                'x': risk_by_category.columns.tolist(),
+                'y': risk_by_category.index.tolist(),
+                'z': risk_by_category.to_numpy(),
+                'coloraxis': 'coloraxis',
+                'hovertemplate': 'Risk Level: %{x}<br>Category: %{y}<br>Count: %{z}<extra></extra>'
+            }
+        ],
+        'layout': {
+            'title': {'text': 'Risk Distribution by Category'},
+            'xaxis': {'title': {'text': 'Risk Level'}},
+            'yaxis': {'title': {'text': 'Category'}, 'autorange': 'reversed'},
+            'coloraxis': {'colorbar': {'title': {'text': 'Count'}}},
+            'height': 300,
+            'uirevision': CHART_UIREVISION
+        }
+    }
     
-    fig.update_layout(height=300)
-    return fig
+    return go.Figure(fig)
 
+@lru_cache(maxsize=4096)
 def format_currency(amount):
     """
     Format currency for display
@@ -122,41 +200,29 @@ def get_risk_color(risk_level):
     """
     Get color for risk level
     """
-    colors = {
-        'LOW': '#28a745',
-        'MEDIUM': '#ffc107', 
-        'HIGH': '#fd7e14',
-        'CRITICAL': '#dc3545'
-    }
-    return colors.get(risk_level, '#6c757d')
+    return RISK_COLORS.get(risk_level, DEFAULT_COLOR)
 
 def get_recommendation_color(recommendation):
     """
     Get color for recommendation
     """
-    colors = {
-        'NO ACTION': '#28a745',
-        'REALLOCATE': '#17a2b8',
-        'MARKDOWN': '#ffc107',
-        'DONATE': '#6f42c1',
-        'LIQUIDATE': '#dc3545',
-        'REALLOCATE+MARKDOWN': '#20c997'  # Teal color for the combined strategy
-    }
-    return colors.get(recommendation, '#6c757d')
+    return RECOMMENDATION_COLORS.get(recommendation, DEFAULT_COLOR)
 
 def create_summary_metrics(df):
     """
     Create summary metrics for dashboard
     """
     total_items = len(df)
-    critical_items = len(df[df['risk_level'] == 'CRITICAL'])
-    total_value = df['potential_loss'].sum()
-    expected_recovery = df['expected_recovery'].sum()
+    # Both totals in one reduction, and the critical count as an integer code compare
+    total_value, expected_recovery = df[['potential_loss', 'expected_recovery']].to_numpy(dtype=float).sum(axis=0)
+    risk_level = df['risk_level'].cat
+    critical_items = np.count_nonzero(risk_level.codes.to_numpy() == risk_level.categories.get_loc('CRITICAL'))
     potential_savings = expected_recovery - (total_value - expected_recovery)
     
     return {
         'total_items': total_items,
         'critical_items': critical_items,
+        'critical_pct': (critical_items / total_items * 100) if total_items > 0 else 0,
         'total_value': total_value,
         'expected_recovery': expected_recovery,
         'potential_savings': potential_savings,